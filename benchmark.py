@@ -0,0 +1,663 @@
+#!/usr/bin/env python3
+
+"""
+Timing benchmarks for the list implementations behind the prac6 editor.
+
+Run from the command line, e.g.
+
+    python3 benchmark.py random_access --file thelostworld.txt
+
+The suite benchmark times every editor command and the core list
+operations at several buffer sizes, made by repeating the text file,
+and can check the results against a stored baseline:
+
+    python3 benchmark.py suite --sizes 1,10,100 --json results.json
+    python3 benchmark.py suite --save-baseline baseline.json
+    python3 benchmark.py suite --baseline baseline.json
+
+@since          18 October 2026
+@input          the text file to load into the buffers
+@output         a table of timings on the console, and optionally JSON
+@errorHandling  exits with status 1 if the suite finds a regression
+@knownBugs      none
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from prac6 import BUFFER_TYPES, compile_filter, find_lines
+from prac6 import (read_from_file, write_to_file, print_n, delete_n, insert,
+                   append, filter_word)
+from parallel_search import default_workers, matching_positions, search_chunk
+from buffer_server import BufferServer, BufferClient
+from word_index import WORD
+
+
+def load_lines(file_name):
+    """
+    Reads the lines of a text file, without their newlines.
+
+    @complexity O(N) where N is the size of the file.
+    """
+    with open(file_name, "r") as f:
+        return [line.strip("\n") for line in f]
+
+
+def build_buffer(buffer_type, lines):
+    """
+    Builds a buffer of the given type holding lines, returns its iterator.
+
+    @complexity O(N) times the cost of add_here() on the buffer.
+    """
+    list_it = iter(BUFFER_TYPES[buffer_type]())
+    for line in lines:
+        list_it.add_here(line)
+    return list_it
+
+
+def timed(function, *args):
+    """
+    Calls function(*args) and returns how long it took, in seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def walk_from_head(list_it, line_numbers):
+    """Random line access as prac6 did it before seek(): reset and walk."""
+    for n in line_numbers:
+        list_it.reset()
+        for _ in range(n - 1):
+            list_it.next()
+        list_it.peek()
+
+
+def seek_to(list_it, line_numbers):
+    """Random line access through the iterator's seek()."""
+    for n in line_numbers:
+        list_it.seek(n - 1)
+        list_it.peek()
+
+
+def bench_random_access(file_name, lookups=2000, seed=1008):
+    """
+    Compares random access to line N of file_name, as print_n, delete_n
+    and insert do it, before and after seek() and the skip list.
+
+    @complexity O(lookups * N) for the linked list walks
+    """
+    lines = load_lines(file_name)
+    rng = random.Random(seed)
+    line_numbers = [rng.randint(1, len(lines)) for _ in range(lookups)]
+
+    linked_it = build_buffer("linked", lines)
+    skip_it = build_buffer("skiplist", lines)
+    results = [
+        ("linked, reset and next()", timed(walk_from_head, linked_it,
+                                            line_numbers)),
+        ("linked, seek()", timed(seek_to, linked_it, line_numbers)),
+        ("skiplist, seek()", timed(seek_to, skip_it, line_numbers)),
+    ]
+
+    print("Random access to {0} lines of {1} ({2} lines)".format(
+        lookups, file_name, len(lines)))
+    for name, seconds in results:
+        print("{0:<28} {1:9.4f} s {2:10.1f} us/line".format(
+            name, seconds, seconds / lookups * 1e6))
+
+
+def traverse(list_it, repeats):
+    """Walks the whole buffer with the iterator, repeats times."""
+    for _ in range(repeats):
+        list_it.reset()
+        for _ in list_it:
+            pass
+
+
+def bench_memory(file_name, repeats=20):
+    """
+    Compares, for every buffer type, the memory it takes to hold the lines
+    of file_name (not counting the line strings themselves, which all of
+    them share) and how long a full traversal with the iterator takes.
+
+    @complexity O(repeats * N) for each buffer type
+    """
+    lines = load_lines(file_name)
+    print("Memory and traversal of {0} ({1} lines)".format(
+        file_name, len(lines)))
+    for buffer_type in sorted(BUFFER_TYPES):
+        tracemalloc.start()
+        list_it = build_buffer(buffer_type, lines)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        seconds = timed(traverse, list_it, repeats) / repeats
+        print("{0:<12} {1:9.1f} KiB {2:7.1f} bytes/line "
+              "{3:8.2f} ms/traversal".format(buffer_type, size / 1024,
+                                             size / len(lines),
+                                             seconds * 1000))
+
+
+def bench_compressed(file_name, lookups=2000, seed=1008):
+    """
+    Weighs the compressed buffer against the linked one on the lines of
+    file_name: its compression ratio, the memory each takes counting the
+    line strings (which the compressed buffer does not keep), and what the
+    compression costs in traversal time and random access latency, for
+    several cache sizes.
+
+    @complexity O(N + lookups * B) for each cache size, for blocks of B
+    """
+    raw = os.path.getsize(file_name)
+    rng = random.Random(seed)
+    print("Compressed buffer on {0} ({1} bytes)".format(file_name, raw))
+    print("{0:<18} {1:>7} {2:>10} {3:>10} {4:>13}".format(
+        "buffer", "ratio", "KiB", "ms/walk", "us/random"))
+
+    rows = [("linked", BUFFER_TYPES["linked"], {})]
+    for cache_blocks in (1, 8, 64):
+        rows.append(("compressed, {0:>2}".format(cache_blocks),
+                     BUFFER_TYPES["compressed"], {"cache_blocks": cache_blocks}))
+    for name, list_type, options in rows:
+        tracemalloc.start()
+        my_list = list_type(**options)
+        iter(my_list).splice(load_lines(file_name))
+        if hasattr(my_list, "compressed_size"):
+            ratio = raw / my_list.compressed_size()
+        else:
+            ratio = 1.0
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        list_it = iter(my_list)
+        walk = timed(traverse, list_it, 5) / 5
+        line_numbers = [rng.randint(1, len(my_list))
+                        for _ in range(lookups)]
+        random_access = timed(seek_to, list_it, line_numbers) / lookups
+        print("{0:<18} {1:7.2f} {2:10.1f} {3:10.2f} {4:13.1f}".format(
+            name, ratio, size / 1024, walk * 1000, random_access * 1e6))
+
+
+def find_all(list_it, words):
+    """Runs find_lines() for each of words."""
+    for word in words:
+        find_lines(list_it, word)
+
+
+def bench_word_index(file_name, queries=200, seed=1008):
+    """
+    Compares loading file_name into a linked list and then finding the
+    lines containing each of a random sample of its words, with and without
+    the word index.
+
+    @complexity O(queries * N) without the index
+    """
+    lines = load_lines(file_name)
+    rng = random.Random(seed)
+    words = [rng.choice(WORD.findall(line))
+             for line in rng.sample(lines, queries) if WORD.search(line)]
+
+    print("Finding {0} words in {1} ({2} lines)".format(
+        len(words), file_name, len(lines)))
+    for indexed in (False, True):
+        start = time.perf_counter()
+        list_it = iter(BUFFER_TYPES["linked"]())
+        if indexed:
+            list_it.linked_list.enable_word_index()
+        for line in lines:
+            list_it.add_here(line)
+        load = time.perf_counter() - start
+        seconds = timed(find_all, list_it, words)
+        print("{0:<14} load {1:8.4f} s   queries {2:8.4f} s "
+              "{3:9.1f} us/query".format(
+                  "index on" if indexed else "index off", load, seconds,
+                  seconds / len(words) * 1e6))
+
+
+def bench_parallel(file_name, copies=20):
+    """
+    Measures how searching file_name, repeated copies times, for a set of
+    words scales with the number of worker processes, from 1 to the number
+    of processors, against searching on this process alone.
+
+    @complexity O(copies * N) for each number of workers
+    """
+    lines = load_lines(file_name) * copies
+    matcher = compile_filter(["Challenger", "Summerlee", "Roxton", "Malone",
+                              "plateau", "jungle"], ignore_case=True)
+
+    print("Searching {0} lines ({1} copies of {2})".format(
+        len(lines), copies, file_name))
+    serial = timed(search_chunk, matcher, 0, lines)
+    print("{0:<12} {1:8.4f} s".format("serial", serial))
+    for workers in range(1, default_workers() + 1):
+        # The first search starts the pool, so don't time that one
+        matching_positions(lines[:workers], matcher, workers)
+        seconds = timed(matching_positions, lines, matcher, workers)
+        print("{0:<12} {1:8.4f} s  speedup {2:5.2f}x".format(
+            "{0} workers".format(workers), seconds, serial / seconds))
+
+
+def add_one_by_one(buffer_type, lines):
+    """Loads lines into a new buffer with add_here(), as read used to."""
+    list_it = iter(BUFFER_TYPES[buffer_type]())
+    for line in lines:
+        list_it.add_here(line)
+
+
+def add_spliced(buffer_type, lines):
+    """Loads lines into a new buffer with one splice()."""
+    iter(BUFFER_TYPES[buffer_type]()).splice(lines)
+
+
+def bench_splice(file_name, copies=10):
+    """
+    Compares loading file_name, repeated copies times, into each buffer
+    type one add_here() at a time and with one splice().
+
+    @complexity O(copies * N) for each buffer type
+    """
+    lines = load_lines(file_name) * copies
+    print("Loading {0} lines ({1} copies of {2})".format(
+        len(lines), copies, file_name))
+    for buffer_type in sorted(BUFFER_TYPES):
+        one_by_one = timed(add_one_by_one, buffer_type, lines)
+        spliced = timed(add_spliced, buffer_type, lines)
+        print("{0:<12} add_here {1:8.4f} s  splice {2:8.4f} s  "
+              "speedup {3:5.2f}x".format(buffer_type, one_by_one, spliced,
+                                         one_by_one / spliced))
+
+
+async def load_client(port, buffer, requests, seed):
+    """
+    One client of bench_server(): sends requests random prints, inserts
+    and deletes on its buffer.
+    """
+    rng = random.Random(seed)
+    client = await BufferClient.connect(port)
+    length = len(await client.request(buffer, "printall"))
+    for _ in range(requests):
+        kind = rng.random()
+        if kind < 0.7 or length < 2:
+            await client.request(buffer, "print", rng.randint(1, length))
+        elif kind < 0.85:
+            await client.request(buffer, "insert", rng.randint(0, length),
+                                 data=["inserted line"])
+            length += 1
+        else:
+            await client.request(buffer, "delete", rng.randint(1, length))
+            length -= 1
+    await client.close()
+
+
+async def serve_load(file_name, clients, requests):
+    """
+    Starts a BufferServer, loads file_name into a buffer for each of
+    clients load clients, and runs them against it at once.
+
+    @return     the number of requests answered, per second
+    """
+    server = BufferServer()
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    names = ["buffer{0}".format(i) for i in range(clients)]
+    loader = await BufferClient.connect(port)
+    for name in names:
+        await loader.request(name, "read", file_name)
+    await loader.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(load_client(port, name, requests, seed)
+                           for seed, name in enumerate(names)))
+    seconds = time.perf_counter() - start
+    listener.close()
+    await listener.wait_closed()
+    return clients * requests / seconds
+
+
+def bench_server(file_name, clients=8, requests=500):
+    """
+    Load-generates requests against a BufferServer over TCP, with every
+    client on a buffer of its own, and reports requests per second.
+
+    @complexity O(clients * requests) times the cost of one request
+    """
+    print("{0} clients, {1} requests each, on {2}".format(
+        clients, requests, file_name))
+    for count in sorted({1, clients}):
+        rate = asyncio.run(serve_load(file_name, count, requests))
+        print("{0:<12} {1:10.0f} requests/s".format(
+            "{0} clients".format(count), rate))
+
+
+## THE SUITE
+
+# How many times the suite runs each case; it keeps the fastest time
+SUITE_REPEATS = 3
+
+# How many lines the per-line commands (print, delete, insert, ...) act on
+SUITE_OPERATIONS = 200
+
+# Buffer sizes the suite runs at by default, in MB
+SUITE_SIZES = [0.5, 2, 8]
+
+
+def replicate(file_name, megabytes, directory):
+    """
+    Writes a copy of file_name repeated until it is at least megabytes big.
+
+    @return     the name of the new file
+    @complexity O(S), where S is the size of the new file
+    """
+    with open(file_name, "r") as f:
+        text = f.read()
+    if not text.endswith("\n"):
+        text += "\n"
+    copies = max(1, math.ceil(megabytes * 1e6 / len(text.encode())))
+    out_name = os.path.join(directory, "bench_{0}MB.txt".format(megabytes))
+    with open(out_name, "w") as out:
+        for _ in range(copies):
+            out.write(text)
+    return out_name
+
+
+def timed_quietly(function, *args):
+    """
+    Calls function(*args) with its console output thrown away, and returns
+    how long it took, in seconds.
+    """
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            return timed(function, *args)
+
+
+def print_lines(list_it, numbers):
+    for n in numbers:
+        print_n(list_it, n)
+
+
+def delete_lines(list_it, numbers):
+    for n in numbers:
+        delete_n(list_it, n)
+
+
+def insert_lines(list_it, numbers):
+    for n in numbers:
+        insert(list_it, ["inserted"], n)
+
+
+def append_lines(list_it, count):
+    for _ in range(count):
+        append(list_it, ["appended"])
+
+
+def add_first_items(linked_list, count):
+    for i in range(count):
+        linked_list.add_first(i)
+
+
+def find_missing(linked_list, count):
+    for _ in range(count):
+        linked_list.find_linear("not in the list")
+
+
+def delete_items(linked_list, items):
+    for item in items:
+        linked_list.delete_item(item)
+
+
+def suite_case(case, buffer_type, file_name, lines, rng):
+    """
+    Sets up and times one case of the suite on a fresh buffer.
+
+    @return     the time taken in seconds, or None if the case doesn't
+                apply to this buffer type
+    """
+    # Leave at least as many lines as there are deletes, even in a short
+    # file, so that every line number stays in range
+    operations = min(SUITE_OPERATIONS, len(lines) // 2)
+    numbers = [rng.randint(1, len(lines) - operations)
+               for _ in range(operations)]
+
+    if case == "read_from_file":
+        return timed_quietly(read_from_file, iter(BUFFER_TYPES[buffer_type]()),
+                             file_name)
+    if case == "build (add_here)":
+        return timed(build_buffer, buffer_type, lines)
+
+    list_it = build_buffer(buffer_type, lines)
+    if case == "write_to_file":
+        out_name = file_name + ".out"
+        seconds = timed_quietly(write_to_file, list_it, out_name)
+        os.remove(out_name)
+        return seconds
+    if case == "traverse":
+        return timed(traverse, list_it, 1)
+    if case == "print_n":
+        return timed_quietly(print_lines, list_it, numbers)
+    if case == "delete_n":
+        return timed_quietly(delete_lines, list_it, numbers)
+    if case == "insert":
+        return timed_quietly(insert_lines, list_it, numbers)
+    if case == "append":
+        return timed_quietly(append_lines, list_it, operations)
+    if case == "filter_word":
+        return timed_quietly(filter_word, list_it, "Challenger")
+
+    linked_list = list_it.linked_list
+    if case == "add_first":
+        return timed(add_first_items, linked_list, operations)
+    if case == "find_linear":
+        if not hasattr(linked_list, "find_linear"):
+            return None
+        return timed(find_missing, linked_list, 10)
+    if case == "delete_item":
+        if not hasattr(linked_list, "delete_item"):
+            return None
+        # Each line once: a short file is likely to draw a number twice
+        items = [lines[n - 1] for n in list(dict.fromkeys(numbers))[:10]]
+        return timed(delete_items, linked_list, items)
+    raise ValueError("unknown case: " + case)
+
+
+SUITE_CASES = ["read_from_file", "write_to_file", "build (add_here)",
+               "traverse", "print_n", "delete_n", "insert", "append",
+               "filter_word", "add_first", "find_linear", "delete_item"]
+
+
+def scaling_exponent(points):
+    """
+    Fits time = c * lines ** k to points by least squares on a log-log
+    scale, so k is about 1 for O(N) and 2 for O(N^2).
+
+    @param      points: list of (lines, seconds)
+    @return     k, or None if there are fewer than two usable points
+    """
+    points = [(math.log(n), math.log(t)) for n, t in points if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run_suite(file_name, sizes=SUITE_SIZES, buffer_types=("linked",),
+              repeats=SUITE_REPEATS, seed=1008):
+    """
+    Times every case of the suite for every buffer type, on file_name
+    repeated up to each of the sizes.
+
+    @return     dictionary of results, ready to be dumped as JSON
+    @complexity depends on the cases; dominated by the largest size
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for megabytes in sizes:
+            size_file = replicate(file_name, megabytes, directory)
+            lines = load_lines(size_file)
+            for buffer_type in buffer_types:
+                for case in SUITE_CASES:
+                    times = []
+                    for _ in range(repeats):
+                        rng = random.Random(seed)
+                        seconds = suite_case(case, buffer_type, size_file,
+                                             lines, rng)
+                        if seconds is None:
+                            break
+                        times.append(seconds)
+                    if not times:
+                        continue
+                    result = {"case": case, "buffer": buffer_type,
+                              "megabytes": megabytes, "lines": len(lines),
+                              "seconds": min(times)}
+                    results.append(result)
+                    print("{0:>6} MB {1:<10} {2:<17} {3:10.5f} s".format(
+                        megabytes, buffer_type, case, result["seconds"]))
+
+    scaling = {}
+    for buffer_type in buffer_types:
+        for case in SUITE_CASES:
+            points = [(r["lines"], r["seconds"]) for r in results
+                      if r["case"] == case and r["buffer"] == buffer_type]
+            exponent = scaling_exponent(points)
+            if exponent is not None:
+                scaling[buffer_type + ": " + case] = {
+                    "exponent": round(exponent, 3), "points": points}
+
+    return {"file": file_name, "python": platform.python_version(),
+            "repeats": repeats, "operations": SUITE_OPERATIONS,
+            "results": results, "scaling": scaling}
+
+
+def result_key(result):
+    return "{0}: {1} @ {2} MB".format(result["buffer"], result["case"],
+                                      result["megabytes"])
+
+
+def find_regressions(report, baseline, tolerance, min_seconds):
+    """
+    Compares a suite report with a baseline report.
+
+    @param      tolerance: how much slower than the baseline a case may be,
+                as a fraction (0.5 allows 50% slower)
+    @param      min_seconds: cases faster than this in both are too noisy
+                to compare, and are skipped
+    @return     list of descriptions of the cases that regressed, and of
+                the cases in the baseline that the report is missing;
+                cases new in the report are only printed
+    """
+    before = {result_key(r): r["seconds"] for r in baseline["results"]}
+    after = {result_key(r) for r in report["results"]}
+    regressions = ["{0}: in the baseline but not in this report".format(key)
+                   for key in sorted(before) if key not in after]
+    for result in report["results"]:
+        key = result_key(result)
+        if key not in before:
+            print("No baseline for " + key)
+            continue
+        old, new = before[key], result["seconds"]
+        if max(old, new) < min_seconds:
+            continue
+        if new > old * (1 + tolerance):
+            regressions.append("{0}: {1:.5f} s, baseline {2:.5f} s "
+                               "({3:+.0%})".format(key, new, old,
+                                                   new / old - 1))
+    return regressions
+
+
+def suite_main(args):
+    """
+    Runs the suite as asked on the command line, and checks it against a
+    baseline if one was given.
+
+    @return     exit status: 0 if all went well, 1 if there were regressions
+    """
+    sizes = [float(size) if "." in size else int(size)
+             for size in args.sizes.split(",")]
+    buffer_types = args.buffers.split(",")
+    for buffer_type in buffer_types:
+        if buffer_type not in BUFFER_TYPES:
+            raise ValueError("unknown buffer type: " + buffer_type)
+    report = run_suite(args.file, sizes, buffer_types, args.repeats)
+
+    print("Scaling (time ~ lines ** k):")
+    for name, fit in sorted(report["scaling"].items()):
+        print("  {0:<30} k = {1:5.2f}".format(name, fit["exponent"]))
+
+    for out_name in (args.json, args.save_baseline):
+        if out_name:
+            with open(out_name, "w") as out:
+                json.dump(report, out, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.tolerance,
+                                       args.min_seconds)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regressions against " + args.baseline)
+    return 0
+
+
+BENCHMARKS = {
+    "compressed": bench_compressed,
+    "memory": bench_memory,
+    "parallel": bench_parallel,
+    "random_access": bench_random_access,
+    "server": bench_server,
+    "splice": bench_splice,
+    "word_index": bench_word_index,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("benchmark", nargs="*",
+                        help="benchmarks to run, out of {0} and suite "
+                             "(default: all but suite)".format(
+                                 ", ".join(sorted(BENCHMARKS))))
+    parser.add_argument("--file", default="thelostworld.txt",
+                        help="text file to load into the buffers")
+    suite = parser.add_argument_group("suite options")
+    suite.add_argument("--sizes", default=",".join(map(str, SUITE_SIZES)),
+                       help="comma-separated buffer sizes in MB")
+    suite.add_argument("--buffers", default="linked",
+                       help="comma-separated buffer types")
+    suite.add_argument("--repeats", type=int, default=SUITE_REPEATS,
+                       help="runs of each case, keeping the fastest")
+    suite.add_argument("--json", metavar="FILE",
+                       help="write the results to FILE as JSON")
+    suite.add_argument("--save-baseline", metavar="FILE",
+                       help="write the results to FILE to compare with later")
+    suite.add_argument("--baseline", metavar="FILE",
+                       help="fail if a case is slower than in FILE")
+    suite.add_argument("--tolerance", type=float, default=0.5,
+                       help="fraction slower than the baseline allowed")
+    suite.add_argument("--min-seconds", type=float, default=0.005,
+                       help="don't compare cases faster than this")
+    args = parser.parse_args()
+    for name in args.benchmark:
+        if name not in BENCHMARKS and name != "suite":
+            parser.error("unknown benchmark: " + name)
+    status = 0
+    for name in args.benchmark or sorted(BENCHMARKS):
+        if name == "suite":
+            status = suite_main(args)
+        else:
+            BENCHMARKS[name](args.file)
+    sys.exit(status)
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+
+"""
+A server holding named text buffers that several local tools can edit at
+once, with the prac6 editor's commands, over TCP or a Unix socket.
+
+Each request is one line, the name of the buffer followed by an editor
+command and its arguments:
+
+    <buffer> read <file>        <buffer> write <file>
+    <buffer> print <n>          <buffer> delete <n>
+    <buffer> insert <n>         <buffer> append
+    <buffer> filter [-v] [-i] [-w] [-r] <word>...
+    <buffer> printall
+
+insert and append are followed by the lines to add and a line holding
+only ".", as in the editor. A buffer is made empty the first time it is
+named. Each response is a line "OK <n>" followed by the n lines of
+output, or a line "ERR <message>".
+
+Requests on one buffer run one at a time, in the order they arrive.
+Commands that may take long (read, write, printall and filter) run on a
+worker thread, so that requests on other buffers carry on meanwhile.
+
+@since          18 October 2026
+@input          requests from the clients
+@output         responses to the clients
+@errorHandling  a request that fails gets an ERR response; the connection
+                and the buffer stay usable
+@knownBugs      the buffers are linked lists, so the worker threads share
+                the interpreter lock with the event loop; a long command
+                slows the others down rather than stopping them
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import tempfile
+
+from unsorted_linked_list import UnsortedLinkedList
+from prac6 import compile_filter, filter_lines, parse_options, write_to_file
+
+DEFAULT_PORT = 8765
+
+# Commands run on a worker thread, because they take time in the size of
+# the buffer or of a file
+SLOW_COMMANDS = {"read", "write", "printall", "filter"}
+
+# Commands followed by lines of data
+DATA_COMMANDS = {"insert", "append"}
+
+# The longest line a request may have, in bytes (asyncio's default limit)
+LINE_LIMIT = 2 ** 16
+
+
+def line_number(list_it, args, allow_end=False):
+    """
+    @return     the line number in args[0], as a 1-based line of the buffer
+                (or 0 to len(buffer) if allow_end)
+    @raises     ValueError if it is missing, not a number or out of range
+    """
+    if not args:
+        raise ValueError("Missing line number.")
+    try:
+        n = int(args[0])
+    except ValueError:
+        raise ValueError("Line number needs to be an integer.")
+    lowest = 0 if allow_end else 1
+    if not lowest <= n <= len(list_it.linked_list):
+        raise ValueError("Line number out of range.")
+    return n
+
+
+def do_read(list_it, args, data):
+    """Adds the lines of a file at the cursor."""
+    if not args:
+        raise ValueError("Missing file name.")
+    with open(args[0], "r") as f:
+        list_it.splice(line.strip("\n") for line in f)
+    return []
+
+
+def do_write(list_it, args, data):
+    """Writes the buffer to a file, and returns the editor's report."""
+    if not args:
+        raise ValueError("Missing file name.")
+    messages = []
+    if not write_to_file(list_it, args[0], report=messages.append):
+        raise OSError(" ".join(messages) or "File not saved.")
+    return messages
+
+
+def do_print(list_it, args, data):
+    """Returns line n."""
+    list_it.seek(line_number(list_it, args) - 1)
+    return [str(list_it.peek())]
+
+
+def do_delete(list_it, args, data):
+    """Deletes line n, and returns it."""
+    list_it.seek(line_number(list_it, args) - 1)
+    return [str(list_it.delete())]
+
+
+def do_insert(list_it, args, data):
+    """Adds the data lines after line n (0 for the start)."""
+    list_it.seek(line_number(list_it, args, allow_end=True))
+    list_it.splice(data)
+    return []
+
+
+def do_append(list_it, args, data):
+    """Adds the data lines at the end."""
+    list_it.seek(len(list_it.linked_list))
+    list_it.splice(data)
+    return []
+
+
+def do_filter(list_it, args, data):
+    """Deletes the lines matching the words, as the editor's filter."""
+    options, _, args = parse_options(args, ("-v", "-i", "-w", "-r"))
+    if "-r" in options:
+        args = [" ".join(args)] if args else []
+    else:
+        args = [word for word in args if word]
+    total = len(list_it.linked_list)
+    matcher = compile_filter(args, "-r" in options, "-i" in options,
+                             "-w" in options)
+    deleted = filter_lines(list_it, matcher, "-v" in options)
+    return ["Filtered out {0} of {1} lines.".format(deleted, total)]
+
+
+def do_printall(list_it, args, data):
+    """Returns every line."""
+    list_it.reset()
+    return [str(item) for item in list_it]
+
+
+COMMANDS = {
+    "read": do_read,
+    "write": do_write,
+    "print": do_print,
+    "delete": do_delete,
+    "insert": do_insert,
+    "append": do_append,
+    "filter": do_filter,
+    "printall": do_printall,
+}
+
+
+class Buffer:
+    """
+    A named buffer: the list, the iterator its commands share, and the
+    lock that makes them take turns.
+    """
+
+    def __init__(self):
+        self.list_it = iter(UnsortedLinkedList())
+        self.lock = asyncio.Lock()
+
+
+class BufferServer:
+    """
+    Holds the buffers and answers the clients' requests on them.
+    """
+
+    def __init__(self, executor=None):
+        """
+        @param      executor: where to run the slow commands; None for the
+                    event loop's default thread pool
+        """
+        self.buffers = {}
+        self.executor = executor
+        self.requests = 0
+
+    async def execute(self, request, data=None):
+        """
+        Runs one request on its buffer, after the requests on that buffer
+        that came before it.
+
+        @param      request: the words of the request line
+        @param      data: the lines following an insert or append
+        @return     the lines of output
+        @raises     ValueError, IndexError, OSError or re.error if the
+                    request fails
+        """
+        if len(request) < 2:
+            raise ValueError("Requests are: <buffer> <command> [arguments]")
+        name, command, args = request[0], request[1], request[2:]
+        if command not in COMMANDS:
+            raise ValueError("Unrecognized command: " + command)
+        handler = COMMANDS[command]
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self.buffers[name] = Buffer()
+
+        async with buffer.lock:
+            self.requests += 1
+            if command in SLOW_COMMANDS:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor, handler, buffer.list_it, args, data)
+            return handler(buffer.list_it, args, data)
+
+    async def handle_client(self, reader, writer):
+        """
+        Answers the requests of one connection until the client closes it.
+        """
+        try:
+            while True:
+                line, too_long = await read_line(reader)
+                if not line:
+                    break
+                # Read the whole request before decoding any of it, so that
+                # one that can't be decoded, or is too long, is skipped as
+                # a whole
+                fields = line.rstrip(b"\r\n").split(b" ")
+                data = None
+                if len(fields) > 1 and \
+                        fields[1].decode("utf-8", "replace") in DATA_COMMANDS:
+                    data, data_too_long = await read_data(reader)
+                    too_long = too_long or data_too_long
+                response = None
+                if too_long:
+                    response = ["ERR Lines must be at most {0} bytes."
+                                .format(LINE_LIMIT)]
+                else:
+                    try:
+                        request = line.decode("utf-8").rstrip("\r\n")
+                        request = request.split(" ")
+                        if data is not None:
+                            data = [raw.decode("utf-8") for raw in data]
+                    except UnicodeDecodeError:
+                        response = ["ERR Requests must be encoded in UTF-8."]
+                if response is None:
+                    try:
+                        lines = await self.execute(request, data)
+                        response = ["OK {0}".format(len(lines))] + lines
+                    except (ValueError, IndexError, OSError, re.error) as e:
+                        response = ["ERR " + str(e)]
+                writer.write(("\n".join(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, port=DEFAULT_PORT, path=None):
+        """
+        Starts listening on localhost:port, or on the Unix socket path if
+        given.
+
+        @return     the asyncio server
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle_client, path,
+                                                   limit=LINE_LIMIT)
+        return await asyncio.start_server(self.handle_client, "127.0.0.1",
+                                          port, limit=LINE_LIMIT)
+
+
+async def read_line(reader):
+    """
+    Reads one line, skipping the rest of it if it is longer than the
+    stream's limit, so that the next read starts on the next line.
+
+    @return     the line as bytes (b"" at the end of the connection, and no
+                more than the limit of a line too long), and whether it was
+                too long
+    """
+    try:
+        return await reader.readuntil(b"\n"), False
+    except asyncio.IncompleteReadError as e:
+        # The end of the connection, in the middle of a line or not
+        return e.partial, False
+    except asyncio.LimitOverrunError as e:
+        line = await reader.readexactly(e.consumed)
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return line, True
+        except asyncio.IncompleteReadError:
+            return line, True
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+
+
+async def read_data(reader):
+    """
+    @return     the lines up to a line holding only ".", or to the end of
+                the connection, as bytes without their line endings, and
+                whether any of them was too long
+    """
+    data = []
+    too_long = False
+    while True:
+        raw, raw_too_long = await read_line(reader)
+        if not raw:
+            # The end of the connection
+            return data, too_long
+        too_long = too_long or raw_too_long
+        line = raw.rstrip(b"\r\n")
+        if line == b".":
+            return data, too_long
+        data.append(line)
+
+
+class BufferClient:
+    """
+    A connection to a BufferServer.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, port=DEFAULT_PORT, path=None):
+        """
+        @return     a client connected to localhost:port, or to the Unix
+                    socket path if given
+        """
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def request(self, buffer, command, *args, data=None):
+        """
+        Sends a request and waits for its response.
+
+        @param      data: the lines to send after an insert or append
+        @return     the lines of output
+        @raises     RuntimeError with the server's message if it failed
+        """
+        lines = [" ".join((buffer, command) + tuple(map(str, args)))]
+        if data is not None:
+            lines.extend(data)
+            lines.append(".")
+        self.writer.write(("\n".join(lines) + "\n").encode("utf-8"))
+        status = (await self.reader.readline()).decode("utf-8").rstrip("\n")
+        if not status.startswith("OK "):
+            raise RuntimeError(status[4:] or "connection closed")
+        return [(await self.reader.readline()).decode("utf-8").rstrip("\n")
+                for _ in range(int(status[3:]))]
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+## REGRESSION TESTING CODE
+
+def test_server():
+    """Several clients append to one buffer and read it back, and a
+    failed request gets an error without closing the connection.
+    """
+    print("TESTING BufferServer")
+
+    async def client_appends(port, name):
+        client = await BufferClient.connect(port)
+        for i in range(20):
+            await client.request("shared", "append",
+                                 data=["{0} {1}".format(name, i)])
+        await client.close()
+
+    async def run():
+        server = BufferServer()
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        await asyncio.gather(*(client_appends(port, name)
+                               for name in "abc"))
+        client = await BufferClient.connect(port)
+        lines = await client.request("shared", "printall")
+        print("Expected 60 lines, in order for each client, got ", len(lines),
+              [line for line in lines if line.startswith("b")] ==
+              ["b {0}".format(i) for i in range(20)])
+        print("Expected ['Filtered out 40 of 60 lines.'], got ",
+              await client.request("shared", "filter", "-v", "-w", "a"))
+        try:
+            await client.request("shared", "print", 21)
+            print("Expected an exception, but something went wrong")
+        except RuntimeError as error:
+            print("Expected: <class 'RuntimeError'> : Line number out of "
+                  "range.")
+            print("Got     : ", type(error), ": ", error)
+        await client.request("other", "insert", 0, data=["x", "y"])
+        print("Expected ['y'], got ", await client.request("other", "print", 2))
+        await client.request("blank", "append", data=["one", "", "two"])
+        print("Expected ['one', '', 'two'], got ",
+              await client.request("blank", "printall"))
+        for request in (b"blank print \xff\n",
+                        b"blank append\nthree\n\xff\n.\n"):
+            client.writer.write(request)
+            print("Expected ERR Requests must be encoded in UTF-8., got ",
+                  (await client.reader.readline()).decode("utf-8").rstrip())
+        print("Expected ['two'], got ", await client.request("blank", "print",
+                                                             3))
+        for request in (b"blank print " + b"9" * (3 * LINE_LIMIT) + b"\n",
+                        b"blank append\n" + b"x" * (LINE_LIMIT + 1) + b"\n.\n"):
+            client.writer.write(request)
+            print("Expected ERR Lines must be at most", LINE_LIMIT,
+                  "bytes., got ",
+                  (await client.reader.readline()).decode("utf-8").rstrip())
+        print("Expected ['one', '', 'two'], got ",
+              await client.request("blank", "printall"))
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, "latin1.txt")
+            with open(name, "wb") as f:
+                f.write(b"caf\xe9\n")
+            try:
+                await client.request("blank", "read", name)
+                print("Expected an exception, but something went wrong")
+            except RuntimeError as error:
+                print("Expected the decoding error, got ", error)
+        with tempfile.TemporaryDirectory() as directory:
+            report = await client.request(
+                "other", "write", os.path.join(directory, "out.txt"))
+            print("Expected the save report, got ", report)
+        await client.close()
+        listener.close()
+        await listener.wait_closed()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve named text buffers.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help="TCP port to listen on, on localhost")
+    parser.add_argument("--unix", metavar="PATH",
+                        help="listen on a Unix socket at PATH instead")
+    parser.add_argument("--test", action="store_true",
+                        help="run the regression tests and exit")
+    args = parser.parse_args()
+
+    async def serve():
+        listener = await BufferServer().start(args.port, args.unix)
+        print("Serving buffers on " +
+              (args.unix or "127.0.0.1:{0}".format(args.port)))
+        async with listener:
+            await listener.serve_forever()
+
+    if args.test:
+        test_server()
+    else:
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if args.unix is not None and os.path.exists(args.unix):
+                os.remove(args.unix)
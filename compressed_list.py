@@ -0,0 +1,536 @@
+#!/usr/bin/python3
+
+"""
+This file implements the list data type over compressed blocks of items,
+for buffers too big to hold every line as a string of its own.
+
+Runs of up to block_lines consecutive items are pickled and compressed
+with zlib into one CompressedBlock. A small LRU cache holds the items of
+the blocks used most recently, decompressed: the iterator reaches a
+block's items through the cache, which decompresses the block on a miss.
+Blocks changed by add_here(), splice() or delete() are marked dirty, and
+are compressed again when the cache evicts them (or on flush()), so a run
+of edits to one block costs one compression, not one per edit.
+
+Like an unrolled linked list, blocks are split when an insertion
+overflows them and merged with their successor when deletions leave them
+less than half full.
+
+The trade-off, measured by "benchmark.py compressed" on thelostworld.txt
+under CPython 3.11: blocks of 256 lines compress the text 2.1 times, and
+the whole buffer takes 229 KiB with a cache of one block against 1482 KiB
+for an UnsortedLinkedList with its strings. In exchange a full traversal
+takes 5.5 ms instead of 0.8, and random access to a line 99 us instead of
+17, until the cache is big enough to hold every block (64 blocks: 2.4 us).
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past the end
+@knownBugs      items must be picklable; random access to a block that is
+                not cached costs a decompression of the whole block
+"""
+
+import pickle
+import zlib
+from collections import OrderedDict
+
+DEFAULT_BLOCK_LINES = 256
+DEFAULT_CACHE_BLOCKS = 8
+DEFAULT_LEVEL = 6
+
+
+class CompressedBlock:
+    """
+    A run of items, compressed. count is the number of items in it, kept
+    up to date even while the block's decompressed items are being
+    changed in the cache.
+    """
+
+    __slots__ = ("data", "count")
+
+    def __init__(self, count=0):
+        """
+        @complexity  best and worst case: O(1)
+        """
+        self.data = b""
+        self.count = count
+
+
+class CompressedList:
+    """
+    A list kept as a Python list of compressed blocks.
+
+    Invariants for the class:
+        (1) blocks holds the blocks in list order, and none is empty
+        (2) no block holds more than block_lines items
+        (3) cache maps blocks to their decompressed items, least recently
+            used first, and holds at most cache_blocks blocks
+        (4) the data of every block not in dirty decompresses to its items;
+            every block in dirty is in the cache
+        (5) length is the sum of the blocks' counts
+    """
+
+    def __init__(self, size=None, block_lines=DEFAULT_BLOCK_LINES,
+                 cache_blocks=DEFAULT_CACHE_BLOCKS, level=DEFAULT_LEVEL):
+        """
+        Creates an empty list.
+
+        Parameter `size` is included to provide compatibility with the
+        interface of the ArrayList, and then disregarded.
+
+        @param          block_lines: most items a block can hold
+        @param          cache_blocks: how many blocks to keep decompressed
+        @param          level: zlib compression level, from 1 to 9
+        @post           an empty list object is created
+        @complexity     best and worst case: O(1)
+        """
+        self.block_lines = block_lines
+        self.cache_blocks = max(1, cache_blocks)
+        self.level = level
+        self.reset()
+
+    def is_empty(self):
+        """
+        @return         false if list has elements, true if empty
+        @complexity     best and worst case: O(1)
+        """
+        return self.length == 0
+
+    def __len__(self):
+        """
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return self.length
+
+    def __bool__(self):
+        """
+        @return         true if list has elements, false if empty
+        @complexity     best and worst case: O(1)
+        """
+        return not self.is_empty()
+
+    def is_full(self):
+        """
+        Determines whether the list is full, which it never is.
+
+        @return     false
+        @complexity best and worst case: O(1)
+        """
+        return False
+
+    def reset(self):
+        """
+        Resets the list to an empty state.
+
+        @post           the list is empty
+        @complexity     best and worst case: O(1)
+        """
+        self.blocks = []
+        self.length = 0
+        self.cache = OrderedDict()
+        self.dirty = set()
+
+    def items_of(self, block):
+        """
+        Returns the decompressed items of block, from the cache, or
+        decompressing them into it. Changing them must be followed by a
+        call to touched(block), before the cache is used again.
+
+        @complexity O(1) on a cache hit, O(B) on a miss, for B items
+        """
+        items = self.cache.get(block)
+        if items is None:
+            items = pickle.loads(zlib.decompress(block.data))
+            self.cache[block] = items
+            self.evict()
+        else:
+            self.cache.move_to_end(block)
+        return items
+
+    def touched(self, block):
+        """
+        Marks block as changed, to be compressed again when evicted.
+        """
+        self.dirty.add(block)
+
+    def new_block(self, items):
+        """
+        @return     a new block holding items, cached and dirty
+        @complexity O(1), plus the cost of evicting a block
+        """
+        block = CompressedBlock(len(items))
+        self.cache[block] = items
+        self.dirty.add(block)
+        self.evict()
+        return block
+
+    def forget(self, block):
+        """
+        Drops a block taken out of the list from the cache.
+        """
+        self.cache.pop(block, None)
+        self.dirty.discard(block)
+
+    def compress(self, block, items):
+        """
+        Stores items in block, compressed.
+
+        @complexity O(B), for B items
+        """
+        block.data = zlib.compress(
+            pickle.dumps(items, pickle.HIGHEST_PROTOCOL), self.level)
+        self.dirty.discard(block)
+
+    def evict(self):
+        """
+        Evicts the least recently used blocks until the cache fits,
+        compressing them again if they changed.
+        """
+        while len(self.cache) > self.cache_blocks:
+            block, items = self.cache.popitem(last=False)
+            if block in self.dirty:
+                self.compress(block, items)
+
+    def flush(self):
+        """
+        Compresses every changed block, leaving them cached.
+
+        @complexity O(D*B), for D dirty blocks of B items
+        """
+        for block in list(self.dirty):
+            self.compress(block, self.cache[block])
+
+    def compressed_size(self):
+        """
+        @return     the total size in bytes of the compressed blocks
+        @complexity O(N/B), after flushing
+        """
+        self.flush()
+        return sum(len(block.data) for block in self.blocks)
+
+    def add_first(self, new_item):
+        """
+        Adds new_item as the first element of the list.
+
+        @complexity     O(B), where B is block_lines
+        """
+        self.ListIterator(self).add_here(new_item)
+
+    def add(self, new_item):
+        """
+        As for unsorted linked lists, "add()" is synonymous with "add_first()"
+        """
+        self.add_first(new_item)
+
+    class ListIterator:
+        """
+        Implements the same iterator interface as
+        UnsortedLinkedList.ListIterator over a CompressedList.
+
+        The cursor is the index of a block in blocks and an offset into its
+        items, with the index equal to len(blocks) once past the end.
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the list, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.reset()
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        def __next__(self):
+            """
+            Returns the current item and moves to the next one,
+            decompressing its block if it is not cached.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(1) on a cache hit, O(B) on a miss
+            """
+            linked_list = self.linked_list
+            if self.block >= len(linked_list.blocks):
+                raise StopIteration("no more elements in list")
+            block = linked_list.blocks[self.block]
+            item = linked_list.items_of(block)[self.offset]
+            self.offset += 1
+            if self.offset == block.count:
+                self.block += 1
+                self.offset = 0
+            self.position += 1
+            return item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def peek(self):
+            """
+            Returns the current item without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(1) on a cache hit, O(B) on a miss
+            """
+            linked_list = self.linked_list
+            if self.block >= len(linked_list.blocks):
+                raise StopIteration("no more elements in list")
+            return linked_list.items_of(
+                linked_list.blocks[self.block])[self.offset]
+
+        def has_next(self):
+            """
+            @return     true if there is an element not yet iterated over
+            @complexity best and worst case: O(1)
+            """
+            return self.block < len(self.linked_list.blocks)
+
+        def reset(self):
+            """
+            Resets the iterator to point to the start of the list.
+
+            @complexity best and worst case: O(1)
+            """
+            self.block = 0
+            self.offset = 0
+            self.position = 0
+
+        def walked(self, steps):
+            """
+            Called by seek() with the number of blocks it stepped over.
+            Does nothing: stats.enable_counters() replaces it to count them.
+            """
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the item at index is the current one.
+            Whole blocks are skipped by their counts, without decompressing
+            them.
+
+            @raises     IndexError if index is not in 0..len(list)
+            @complexity O(N/B), where B is block_lines
+            """
+            blocks = self.linked_list.blocks
+            if index < 0 or index > self.linked_list.length:
+                raise IndexError("list index out of range")
+            if index < self.position:
+                self.reset()
+            # Index of the first item of the current block
+            first = self.position - self.offset
+            start = self.block
+            while self.block < len(blocks) and \
+                    first + blocks[self.block].count <= index:
+                first += blocks[self.block].count
+                self.block += 1
+            self.walked(self.block - start)
+            self.offset = index - first
+            self.position = index
+
+        def add_here(self, new_item):
+            """
+            Adds an item to the list, before the current one. If the cursor
+            is at the start of a block and the block before it has room,
+            the item goes at the end of that one.
+
+            @complexity O(B), plus O(N/B) to split a block
+            """
+            linked_list = self.linked_list
+            blocks = linked_list.blocks
+            capacity = linked_list.block_lines
+            if self.offset == 0 and self.block > 0 and \
+                    blocks[self.block - 1].count < capacity:
+                block = blocks[self.block - 1]
+                linked_list.items_of(block).append(new_item)
+                block.count += 1
+                linked_list.touched(block)
+            elif self.block == len(blocks):
+                # Past the end, and the last block (if any) is full
+                blocks.append(linked_list.new_block([new_item]))
+                self.block += 1
+            else:
+                block = blocks[self.block]
+                items = linked_list.items_of(block)
+                items.insert(self.offset, new_item)
+                block.count += 1
+                self.offset += 1
+                linked_list.touched(block)
+                if block.count > capacity:
+                    half = block.count // 2
+                    moved = items[half:]
+                    del items[half:]
+                    block.count = half
+                    blocks.insert(self.block + 1,
+                                  linked_list.new_block(moved))
+                    if self.offset >= half:
+                        self.block += 1
+                        self.offset -= half
+            linked_list.length += 1
+            self.position += 1
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable before the current one, in order.
+
+            A run shorter than a block goes in through add_here(), which
+            fills the blocks around the cursor. A longer one splits the
+            current block at the cursor, if it is inside one, tops up the
+            block before the cursor and inserts the rest as new, full blocks.
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @complexity O(M + N/B), for M items, plus compressing the
+                        blocks the cache evicts
+            """
+            items = list(items)
+            linked_list = self.linked_list
+            blocks = linked_list.blocks
+            capacity = linked_list.block_lines
+            if len(items) < capacity:
+                for item in items:
+                    self.add_here(item)
+                return len(items)
+
+            if self.offset > 0:
+                block = blocks[self.block]
+                block_items = linked_list.items_of(block)
+                moved = block_items[self.offset:]
+                del block_items[self.offset:]
+                block.count = self.offset
+                linked_list.touched(block)
+                self.block += 1
+                self.offset = 0
+                blocks.insert(self.block, linked_list.new_block(moved))
+
+            start = 0
+            if self.block > 0:
+                previous = blocks[self.block - 1]
+                start = capacity - previous.count
+                if start > 0:
+                    linked_list.items_of(previous).extend(items[:start])
+                    previous.count += len(items[:start])
+                    linked_list.touched(previous)
+            new_blocks = [linked_list.new_block(items[start:start + capacity])
+                          for start in range(start, len(items), capacity)]
+            blocks[self.block:self.block] = new_blocks
+            self.block += len(new_blocks)
+            linked_list.length += len(items)
+            self.position += len(items)
+            return len(items)
+
+        def delete(self):
+            """
+            Returns the current item, deletes it, and moves to the next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(B), plus O(N/B) to drop or merge a block
+            """
+            linked_list = self.linked_list
+            blocks = linked_list.blocks
+            if self.block >= len(blocks):
+                raise StopIteration("no more elements in list")
+            capacity = linked_list.block_lines
+            block = blocks[self.block]
+            item = linked_list.items_of(block).pop(self.offset)
+            block.count -= 1
+
+            if block.count == 0:
+                linked_list.forget(block)
+                del blocks[self.block]
+                self.offset = 0
+            else:
+                linked_list.touched(block)
+                if self.block + 1 < len(blocks):
+                    successor = blocks[self.block + 1]
+                    if block.count < capacity // 2 and \
+                            block.count + successor.count <= capacity:
+                        moved = linked_list.items_of(successor)
+                        linked_list.items_of(block).extend(moved)
+                        block.count += successor.count
+                        linked_list.touched(block)
+                        linked_list.forget(successor)
+                        del blocks[self.block + 1]
+                if self.offset == block.count:
+                    self.block += 1
+                    self.offset = 0
+            linked_list.length -= 1
+            return item
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def __repr__(self):
+        """
+        @return     Unambiguous string representation of the list
+        @complexity Best and worst case: O(N)
+        """
+        return " ".join(repr(item) for item in self)
+
+    __str__ = __repr__
+
+
+## REGRESSION TESTING CODE
+
+def test_iterator():
+    """Checks the iterator against a Python list after a long run of
+    random inserts, splices, deletes and seeks, with a cache of one block
+    so that nearly every step evicts and compresses one.
+    """
+    import random
+    print("TESTING ListIterator")
+    my_list = CompressedList(block_lines=8, cache_blocks=1)
+    reference = []
+    it = iter(my_list)
+    for step in range(2000):
+        index = random.randint(0, len(reference))
+        it.seek(index)
+        if reference and index < len(reference) and step % 3 == 0:
+            it.delete()
+            del reference[index]
+        elif step % 11 == 0:
+            it.splice(range(step, step + 12))
+            reference[index:index] = range(step, step + 12)
+        else:
+            it.add_here(step)
+            reference.insert(index, step)
+    it.reset()
+    print("Expected True, got ", list(it) == reference)
+    print("Expected no empty or overfull blocks, got counts from",
+          min(block.count for block in my_list.blocks), "to",
+          max(block.count for block in my_list.blocks))
+
+def test_compression():
+    """Repetitive lines compress well, and survive being evicted."""
+    print("TESTING compression")
+    lines = ["line number {0} of the test".format(i) for i in range(1000)]
+    my_list = CompressedList(block_lines=100, cache_blocks=2)
+    iter(my_list).splice(lines)
+    raw = sum(len(line) + 1 for line in lines)
+    print("Expected a ratio over 3, got ",
+          round(raw / my_list.compressed_size(), 1))
+    print("Expected True, got ", list(my_list) == lines)
+
+def test_splice():
+    """Short splices one after the other fill blocks up, as add_here()
+    does, rather than each starting a block of its own.
+    """
+    print("TESTING splice()")
+    my_list = CompressedList(block_lines=4)
+    it = iter(my_list)
+    for i in range(10):
+        it.seek(len(my_list))
+        it.splice([i, -i])
+    print("Expected block counts [4, 4, 4, 4, 4], got ",
+          [block.count for block in my_list.blocks])
+
+
+if __name__ == "__main__":
+    test_iterator()
+    test_compression()
+    test_splice()
@@ -0,0 +1,389 @@
+#!/usr/bin/python3
+
+"""
+This file implements the list data type using doubly linked nodes, so that
+the list can be walked, and its iterator moved, backwards as well as
+forwards.
+
+The list keeps its head, its tail and its length like UnsortedLinkedList,
+and shares the rest of its interface, but every node also refers to its
+predecessor. Reaching the last lines of a long list then costs as much as
+the distance from its end, and deleting the node at the cursor never
+needs to know which node came before it.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past either end, LookupError when deleting an
+                item not in the list
+@knownBugs      none
+"""
+
+from node import DoubleNode
+from unsorted_linked_list import UnsortedLinkedList
+
+
+class DoublyLinkedList(UnsortedLinkedList):
+    """
+    A doubly linked list implementation.
+
+    Invariants for the class, on top of those of UnsortedLinkedList:
+        (1) each node's prev points to the node before it in the list, or
+            None for the head
+    """
+
+    def _link(self, node):
+        """
+        Links node in between its prev and link nodes, which must be next to
+        each other in the list (or None at either end).
+
+        @complexity best and worst case: O(1)
+        """
+        if node.prev is None:
+            self.head = node
+        else:
+            node.prev.link = node
+        if node.link is None:
+            self.tail = node
+        else:
+            node.link.prev = node
+        self.length += 1
+        for index in self.indexes:
+            index.node_added(node, node.prev)
+
+    def _unlink(self, node):
+        """
+        Unlinks node from the list.
+
+        @complexity best and worst case: O(1)
+        """
+        if node.prev is None:
+            self.head = node.link
+        else:
+            node.prev.link = node.link
+        if node.link is None:
+            self.tail = node.prev
+        else:
+            node.link.prev = node.prev
+        self.length -= 1
+        for index in self.indexes:
+            index.node_removed(node, node.prev)
+
+    def add_first(self, new_item):
+        """
+        Adds a new node (containing the input item) as the head of the list.
+
+        @complexity     best and worst case: O(1)
+        """
+        self._link(DoubleNode(new_item, self.head, None))
+
+    def add_last(self, new_item):
+        """
+        Adds a new node (containing the input item) as the tail of the list.
+
+        @complexity     best and worst case: O(1)
+        """
+        self._link(DoubleNode(new_item, None, self.tail))
+
+    def delete_item(self, delitem):
+        """
+        Deletes the first node (if any) containing the input item.
+
+        @return     True if item was in list and has been deleted
+        @throws     LookupError if the list is empty or the item not in it
+        @complexity best case: O(1) (first item), worst case: O(N) (not there)
+        """
+        if self.head is None:
+            raise LookupError("can't delete item from empty list")
+        node = self.find_linear(delitem)
+        if node is None:
+            raise LookupError('item not found')
+        self._unlink(node)
+        return True
+
+    class ListIterator:
+        """
+        Implements the interface of UnsortedLinkedList.ListIterator, plus
+        prev() and has_prev() to move backwards, like a Java ListIterator.
+
+        The cursor sits between two items: current is the node next() will
+        return, and the node prev() will return is current.prev, or the
+        tail when the cursor is past the end.
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the list, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.current = linked_list.head
+            self.position = 0
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        @property
+        def previous(self):
+            """The node before the cursor, or None at the start."""
+            if self.current is None:
+                return self.linked_list.tail
+            return self.current.prev
+
+        def __next__(self):
+            """
+            Returns the item of the current node and moves to the next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            if self.current is None:
+                raise StopIteration("no more elements in list")
+            item = self.current.item
+            self.current = self.current.link
+            self.position += 1
+            return item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def prev(self):
+            """
+            Moves back by one item and returns it, so that next() would
+            return it again.
+
+            @throws     StopIteration if the cursor is at the start
+            @complexity best and worst case: O(1)
+            """
+            node = self.previous
+            if node is None:
+                raise StopIteration("no previous elements in list")
+            self.current = node
+            self.position -= 1
+            return node.item
+
+        def peek(self):
+            """
+            Returns the item of the current node without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            if self.current is None:
+                raise StopIteration("no more elements in list")
+            return self.current.item
+
+        def has_next(self):
+            """
+            @return     true if there is an item after the cursor
+            @complexity best and worst case: O(1)
+            """
+            return self.current is not None
+
+        def has_prev(self):
+            """
+            @return     true if there is an item before the cursor
+            @complexity best and worst case: O(1)
+            """
+            return self.position > 0
+
+        def reset(self):
+            """
+            Resets the iterator to point to the head of the list.
+
+            @complexity best and worst case: O(1)
+            """
+            self.current = self.linked_list.head
+            self.position = 0
+
+        def walked(self, steps):
+            """
+            Called by seek() with the number of nodes it stepped over.
+            Does nothing: stats.enable_counters() replaces it to count them.
+            """
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the node at index is the current one.
+            It walks from whichever is nearest of the cursor, the head and
+            the tail, forwards or backwards.
+
+            @param      index of the node to move to, from 0 to len(list)
+            @raises     IndexError if index is out of range
+            @complexity O(min(index, len(list) - index, |index - position|))
+            """
+            length = len(self.linked_list)
+            if index < 0 or index > length:
+                raise IndexError("list index out of range")
+            distance = abs(index - self.position)
+            if index < distance:
+                self.reset()
+            elif length - index < distance:
+                self.current = None
+                self.position = length
+
+            current = self.current
+            if index > self.position:
+                for _ in range(index - self.position):
+                    current = current.link
+            elif index < self.position:
+                if current is None:
+                    current = self.linked_list.tail
+                    self.position -= 1
+                for _ in range(self.position - index):
+                    current = current.prev
+            self.walked(abs(index - self.position))
+            self.current = current
+            self.position = index
+
+        def add_here(self, new_item):
+            """
+            Adds an item to the list before the current node.
+
+            @post       new_item is just before the cursor, and position
+                        moves on by one
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list._link(
+                DoubleNode(new_item, self.current, self.previous))
+            self.position += 1
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable before the current node, in
+            order, chaining the new nodes first and linking the chain in
+            with a constant number of pointer updates.
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @complexity O(M), where M is the number of items
+            """
+            linked_list = self.linked_list
+            before = self.previous
+            last = before
+            first = None
+            count = 0
+            for count, item in enumerate(items, 1):
+                node = DoubleNode(item, None, last)
+                if first is None:
+                    first = node
+                else:
+                    last.link = node
+                last = node
+            if count == 0:
+                return 0
+
+            last.link = self.current
+            if before is None:
+                linked_list.head = first
+            else:
+                before.link = first
+            if self.current is None:
+                linked_list.tail = last
+            else:
+                self.current.prev = last
+            linked_list.length += count
+            self.position += count
+            for index in linked_list.indexes:
+                node = first
+                while node is not self.current:
+                    index.node_added(node, node.prev)
+                    node = node.link
+            return count
+
+        def delete(self):
+            """
+            Returns the item of the current node, deletes it, and moves to
+            the next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            node = self.current
+            if node is None:
+                raise StopIteration("no more elements in list")
+            self.current = node.link
+            self.linked_list._unlink(node)
+            return node.item
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def reversed_items(self):
+        """
+        @return     generator of the items from the tail back to the head
+        @complexity O(1) per item
+        """
+        node = self.tail
+        while node is not None:
+            yield node.item
+            node = node.prev
+
+
+## REGRESSION TESTING CODE
+
+def test_iterator():
+    """Checks the iterator against a Python list after a long run of
+    random inserts, splices, deletes, seeks and steps back.
+    """
+    import random
+    print("TESTING ListIterator")
+    my_list = DoublyLinkedList()
+    reference = []
+    it = iter(my_list)
+    for step in range(2000):
+        index = random.randint(0, len(reference))
+        it.seek(index)
+        if reference and index < len(reference) and step % 3 == 0:
+            it.delete()
+            del reference[index]
+        elif step % 7 == 0:
+            it.splice([step, -step])
+            reference[index:index] = [step, -step]
+        elif index > 0 and step % 5 == 0:
+            it.prev()
+            it.add_here(step)
+            reference.insert(index - 1, step)
+        else:
+            it.add_here(step)
+            reference.insert(index, step)
+    it.reset()
+    print("Expected True, got ", list(it) == reference)
+    print("Expected True, got ",
+          list(my_list.reversed_items()) == reference[::-1])
+
+def test_prev():
+    """Boundary analysis gives three cases: stepping back from the end,
+    from the middle, and failing at the start.
+    """
+    print("TESTING prev() and has_prev()")
+    my_list = DoublyLinkedList.from_iterable(["a", "b", "c"])
+    it = iter(my_list)
+    it.seek(3)
+    print("Expected 'c', got ", repr(it.prev()))
+    it.delete()
+    print("Expected 'b' at position 1, got ", repr(it.prev()),
+          "at position", it.position)
+    it.prev()
+    print("Expected False, got ", it.has_prev())
+    try:
+        it.prev()
+        print("Expected an exception, but something went wrong")
+    except StopIteration as error:
+        print("Expected: <class 'StopIteration'> : no previous elements in "
+              "list")
+        print("Got     : ", type(error), ": ", error)
+    my_list.add_last("d")
+    my_list.delete_item("a")
+    print("Expected 'b' 'd' with tail 'd', got ", my_list, "with tail",
+          repr(my_list.tail.item))
+
+
+if __name__ == "__main__":
+    test_iterator()
+    test_prev()
@@ -0,0 +1,277 @@
+#!/usr/bin/python3
+
+"""
+A hash index from the items of a linked list to the nodes holding them,
+kept up to date as the list changes.
+
+Attach one to an UnsortedLinkedList with enable_item_index(). The list
+then finds, tests for and deletes items in expected O(1) instead of
+scanning from its head. The index also remembers the node before every
+node, so that a node it finds can be unlinked from a singly linked list
+without walking to it.
+
+An item held by several nodes, such as a line repeated through a file,
+keeps them in list order, so that its first occurrence is at hand too.
+That order comes from labels: every node gets an integer label, and the
+labels increase along the list. A node added between two others takes a
+label between theirs; when there is no room left between them, the labels
+of the nodes around them are spread out again over the smallest aligned
+range that is sparse enough (Bender et al., "Two simplified algorithms for
+maintaining order in a list", 2002), which costs amortised O(log N).
+
+Items must be hashable, as for the keys of a dictionary.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  TypeError for unhashable items
+@knownBugs      adding or removing one of k nodes holding the same item
+                moves up to k references in its list of nodes
+"""
+
+from bisect import bisect_left, insort
+
+# Labels are integers from 0 up to, not including, 2 ** LABEL_BITS
+LABEL_BITS = 62
+
+# The gap left between labels of nodes added one after the other at an end
+LABEL_GAP = 1 << 20
+
+# How much sparser a range of labels must be than the one twice as small
+# inside it, to be spread out over
+DENSITY = 1.5
+
+
+class ItemIndex:
+    """
+    Maps every item to the nodes holding it, in list order, and every node
+    to its label and to the node before it.
+    """
+
+    def __init__(self, linked_list):
+        """
+        Creates an empty index for linked_list.
+
+        @complexity best and worst case: O(1)
+        """
+        self.linked_list = linked_list
+        self.cleared()
+
+    def node_added(self, node, previous):
+        """
+        Indexes a node just linked into the list after previous (None at
+        the head).
+
+        Nodes linked in one after the other and indexed in that order, as
+        splice() does, are labelled together when the first one is.
+
+        @complexity expected O(log k), plus O(k) to move references, for k
+                    nodes holding the same item; amortised O(log N) more
+                    when labels are spread out
+        """
+        if node not in self.labels:
+            self.label(node, previous)
+        nodes = self.nodes.get(node.item)
+        if nodes is None:
+            self.nodes[node.item] = [node]
+        else:
+            insort(nodes, node, key=self.labels.__getitem__)
+        self.previous[node] = previous
+        if node.link is not None:
+            self.previous[node.link] = node
+
+    def label(self, node, previous):
+        """
+        Labels node, just linked in after previous, together with any nodes
+        after it that are not labelled yet.
+
+        @complexity O(m) for a run of m nodes, amortised O(log N) more when
+                    labels are spread out
+        """
+        labels = self.labels
+        run = [node]
+        following = node.link
+        while following is not None and following not in labels:
+            run.append(following)
+            following = following.link
+        low = labels[previous] if previous is not None else -1
+        high = labels[following] if following is not None \
+            else 1 << LABEL_BITS
+        count = len(run)
+
+        if following is None and low + count * LABEL_GAP < high:
+            # At the tail, leave room for more to come after
+            new_labels = (low + LABEL_GAP * i for i in range(1, count + 1))
+        elif previous is None and high - count * LABEL_GAP > low:
+            # At the head, leave room for more to come before
+            new_labels = (high - LABEL_GAP * i for i in range(count, 0, -1))
+        elif high - low > count:
+            new_labels = (low + (high - low) * i // (count + 1)
+                          for i in range(1, count + 1))
+        else:
+            self.spread(previous, run)
+            return
+        for run_node, run_label in zip(run, new_labels):
+            labels[run_node] = run_label
+
+    def spread(self, previous, run):
+        """
+        Labels a run of nodes just linked in after previous, spreading out
+        the labels around them over the smallest aligned range that can
+        hold them all sparsely enough.
+
+        @raises     OverflowError if the list is too long to label
+        @complexity amortised O(log N)
+        """
+        labels = self.labels
+        anchor = labels[previous] if previous is not None else 0
+        before = []
+        after = []
+        back = previous
+        ahead = run[-1].link
+        for bits in range(1, LABEL_BITS + 1):
+            low = anchor >> bits << bits
+            high = low + (1 << bits)
+            while back is not None and labels[back] >= low:
+                before.append(back)
+                back = self.previous[back]
+            while ahead is not None and labels[ahead] < high:
+                after.append(ahead)
+                ahead = ahead.link
+            count = len(before) + len(run) + len(after)
+            if count <= (high - low) / DENSITY ** bits:
+                break
+        else:
+            raise OverflowError("too many nodes to label")
+        before.reverse()
+        for i, node in enumerate(before + run + after):
+            labels[node] = low + (high - low) * i // count
+
+    def node_removed(self, node, previous):
+        """
+        Forgets a node just unlinked from the list, from after previous.
+
+        @complexity expected O(log k), plus O(k) to move references, for k
+                    nodes holding the same item
+        """
+        nodes = self.nodes[node.item]
+        if len(nodes) == 1:
+            del self.nodes[node.item]
+        else:
+            del nodes[bisect_left(nodes, self.labels[node],
+                                  key=self.labels.__getitem__)]
+        del self.labels[node]
+        del self.previous[node]
+        if node.link is not None:
+            self.previous[node.link] = previous
+
+    def cleared(self):
+        """
+        Forgets every node, when the list has been emptied.
+
+        @complexity best and worst case: O(1)
+        """
+        self.nodes = {}
+        self.labels = {}
+        self.previous = {}
+
+    def __contains__(self, item):
+        """
+        @return     true if item is in the list
+        @complexity expected O(1)
+        """
+        return item in self.nodes
+
+    def first(self, item):
+        """
+        @return     the first node in the list holding item, or None
+        @complexity expected O(1)
+        """
+        nodes = self.nodes.get(item)
+        if nodes is None:
+            return None
+        return nodes[0]
+
+    def predecessor(self, node):
+        """
+        @return     the node before node in the list, or None at the head
+        @complexity expected O(1)
+        """
+        return self.previous[node]
+
+
+## REGRESSION TESTING CODE
+
+def test_item_index():
+    """Checks the index follows adds and deletes through the list and its
+    iterator, and that deleting a duplicated item deletes the first one.
+    """
+    from unsorted_linked_list import UnsortedLinkedList
+    print("TESTING ItemIndex")
+    my_list = UnsortedLinkedList.from_iterable(["a", "b", "c", "b"])
+    index = my_list.enable_item_index()
+    it = iter(my_list)
+    it.seek(2)
+    it.splice(["d", "e"])
+    my_list.add_first("b")
+    my_list.delete_item("b")
+    print("Expected 'a' 'b' 'd' 'e' 'c' 'b', got ", my_list)
+    my_list.delete_item("b")
+    print("Expected 'a' 'd' 'e' 'c' 'b' with tail 'b', got ", my_list,
+          "with tail", repr(my_list.tail.item))
+    it = iter(my_list)
+    it.seek(4)
+    it.delete()
+    my_list.delete_item("c")
+    print("Expected 'a' 'd' 'e' with tail 'e', got ", my_list, "with tail",
+          repr(my_list.tail.item))
+    print("Expected True False, got ", "d" in my_list, "b" in my_list)
+    print("Expected 'a', got ", repr(index.predecessor(my_list.find_linear("d"))
+                                     .item))
+    my_list.reset()
+    print("Expected {} {}, got ", index.nodes, index.previous)
+
+def test_order():
+    """Checks, after a long run of random splices, inserts and deletes
+    crowded into a few places so that labels run out and are spread out,
+    that the labels increase along the list and that every item's first
+    node is its first occurrence.
+    """
+    import random
+    from unsorted_linked_list import UnsortedLinkedList
+    print("TESTING ItemIndex order")
+    my_list = UnsortedLinkedList()
+    index = my_list.enable_item_index()
+    it = iter(my_list)
+    for step in range(3000):
+        position = random.choice([0, 1, len(my_list) // 2, len(my_list)])
+        it.seek(min(position, len(my_list)))
+        if my_list and it.has_next() and step % 4 == 0:
+            it.delete()
+        elif step % 5 == 0:
+            it.splice([step % 7] * 3)
+        else:
+            it.add_here(step % 7)
+        if step % 10 == 0 and step % 7 in my_list:
+            # Not through the iterator, which must start again
+            my_list.delete_item(step % 7)
+            it.reset()
+    labels = [index.labels[node] for node in iter_nodes(my_list)]
+    print("Expected True, got ", labels == sorted(set(labels)))
+    firsts = {}
+    for node in iter_nodes(my_list):
+        firsts.setdefault(node.item, node)
+    print("Expected True, got ",
+          all(index.first(item) is node for item, node in firsts.items()))
+
+def iter_nodes(my_list):
+    """Generates the nodes of my_list from its head."""
+    node = my_list.head
+    while node is not None:
+        yield node
+        node = node.link
+
+
+if __name__ == "__main__":
+    test_item_index()
+    test_order()
@@ -0,0 +1,384 @@
+#!/usr/bin/python3
+
+"""
+An append-only journal of the edits made to the editor's buffer, so that
+unsaved work survives a crash without rewriting the whole file after
+every change.
+
+Every add_here() and delete() made through a JournalingIterator is
+appended to a sidecar file next to the file being edited, as one line:
+
+    +<position> <item as a JSON string>
+    -<position>
+
+Replaying those lines, in order, on top of the file as it was when the
+journal was started brings the buffer back to where it was.
+
+Positions only make sense on top of that version of the file, so the
+journal starts with a header naming it, by size, modification time and
+inode:
+
+    =<size> <mtime in ns> <inode>
+
+A journal whose header doesn't match the file on disk is stale: the editor
+saved the file but crashed before clearing the journal, or the file was
+changed since. It is never replayed, but set aside.
+
+@since          18 October 2026
+@input          the journal file, when replaying it
+@output         the journal file
+@errorHandling  a journal cut short by a crash is replayed up to its last
+                complete record, and the rest is dropped; a damaged record
+                before that raises ValueError, and a stale journal
+                is renamed with STALE_SUFFIX instead of being replayed
+@knownBugs      records are flushed to the operating system but not synced
+                to disk, so they survive the editor crashing but not
+                necessarily the machine
+"""
+
+import json
+import os
+
+JOURNAL_SUFFIX = ".journal"
+
+# Added to the name of a stale journal when it is set aside
+STALE_SUFFIX = ".stale"
+
+
+def file_identity(file_name):
+    """
+    @return     the header naming the version of file_name now on disk, or
+                of its absence
+    @complexity best and worst case: O(1)
+    """
+    try:
+        status = os.stat(file_name)
+    except OSError:
+        return "=-\n"
+    return "={0} {1} {2}\n".format(status.st_size, status.st_mtime_ns,
+                                   status.st_ino)
+
+
+class Journal:
+    """
+    The journal of edits to the buffer holding file_name.
+    """
+
+    def __init__(self, file_name):
+        """
+        Creates a journal for file_name, kept in file_name + JOURNAL_SUFFIX.
+        The journal file is not created until the first edit is recorded.
+
+        @complexity best and worst case: O(1)
+        """
+        self.file_name = file_name
+        self.journal_name = file_name + JOURNAL_SUFFIX
+        self.f = None
+
+    def exists(self):
+        """
+        @return     true if there is a journal left to replay
+        """
+        return os.path.exists(self.journal_name)
+
+    def is_stale(self):
+        """
+        @return     true if the journal left to replay was not started on
+                    the version of the file now on disk
+        """
+        with open(self.journal_name, "r", encoding="utf-8") as f:
+            return f.readline() != file_identity(self.file_name)
+
+    def set_aside(self):
+        """
+        Renames a stale journal out of the way, so that it is neither
+        replayed nor added to.
+
+        @return     its new name
+        """
+        self.close()
+        stale_name = self.journal_name + STALE_SUFFIX
+        os.replace(self.journal_name, stale_name)
+        return stale_name
+
+    def _write(self, record):
+        """
+        Appends one record to the journal, and flushes it. A new journal
+        first gets the header naming the file as it is now.
+        """
+        if self.f is None:
+            new = not self.exists()
+            self.f = open(self.journal_name, "a", encoding="utf-8")
+            if new:
+                record = file_identity(self.file_name) + record
+        self.f.write(record)
+        self.f.flush()
+
+    def record_add(self, position, item):
+        """
+        Records that item was added at position.
+
+        @complexity O(L), where L is the length of the item
+        """
+        self._write("+{0} {1}\n".format(position, json.dumps(item)))
+
+    def record_adds(self, position, items):
+        """
+        Records that items were added one after the other from position on,
+        in one write.
+
+        @complexity O(L), where L is the total length of the items
+        """
+        if items:
+            self._write("".join("+{0} {1}\n".format(position + i,
+                                                     json.dumps(item))
+                                for i, item in enumerate(items)))
+
+    def record_delete(self, position):
+        """
+        Records that the item at position was deleted.
+
+        @complexity best and worst case: O(1)
+        """
+        self._write("-{0}\n".format(position))
+
+    def replay(self, list_it):
+        """
+        Applies every record in the journal file to the buffer of list_it,
+        which must hold the file as it was when the journal was started:
+        check is_stale() first.
+
+        If the last record was cut short by a crash (it has no newline), it
+        is dropped, and the journal file is rewritten without it, so that
+        new records don't follow it. Any other record that can't be read or
+        applied means the journal is damaged: nothing after it is replayed,
+        and the journal file is left as it is.
+
+        @param      list_it: iterator of the buffer, not journaling itself
+        @return     the number of records replayed
+        @raises     ValueError naming the first damaged record, if any
+        @complexity O(R*S), where R is the number of records and S the cost
+                    of seek() on the buffer
+        """
+        with open(self.journal_name, "r", encoding="utf-8") as f:
+            header = f.readline()
+            records = f.readlines()
+
+        cut_short = records and not records[-1].endswith("\n")
+        if cut_short:
+            records.pop()
+
+        for number, record in enumerate(records, 1):
+            try:
+                if record[0] == "+":
+                    position, item = record[1:].split(" ", 1)
+                    list_it.seek(int(position))
+                    list_it.add_here(json.loads(item))
+                elif record[0] == "-":
+                    list_it.seek(int(record[1:]))
+                    list_it.delete()
+                else:
+                    raise ValueError("unknown record")
+            except (ValueError, IndexError, StopIteration) as e:
+                raise ValueError("{0}: record {1} is damaged ({2}): {3!r}"
+                                 .format(self.journal_name, number, e,
+                                         record))
+
+        if cut_short:
+            with open(self.journal_name, "w", encoding="utf-8") as f:
+                f.write(header)
+                f.writelines(records)
+        return len(records)
+
+    def clear(self):
+        """
+        Empties the journal, once its edits are in the file itself.
+
+        @complexity best and worst case: O(1)
+        """
+        self.close()
+        if self.exists():
+            os.remove(self.journal_name)
+
+    def close(self):
+        """
+        Closes the journal file, if open. Recording reopens it.
+        """
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+
+class JournalingIterator:
+    """
+    Wraps a buffer's iterator, recording every add_here() and delete() made
+    through it in a Journal. Everything else is passed on unchanged.
+
+    Only the methods of the ListIterator interface are passed on, so that
+    faster ways of adding lines (like a piece table's add_file()) can't
+    bypass the journal.
+    """
+
+    def __init__(self, list_it, journal):
+        """
+        @param      list_it: the iterator to wrap
+        @param      journal: where to record the edits
+        @complexity best and worst case: O(1)
+        """
+        self.list_it = list_it
+        self.journal = journal
+        self.linked_list = list_it.linked_list
+
+    @property
+    def position(self):
+        """The position of the wrapped iterator."""
+        return self.list_it.position
+
+    def __iter__(self):
+        """required so Python recognises it as an iterator"""
+        return self
+
+    def __next__(self):
+        """Returns the current item and moves on, as the wrapped iterator."""
+        return self.list_it.__next__()
+
+    def next(self):
+        """Python2-style alias for __next__()"""
+        return self.list_it.__next__()
+
+    def peek(self):
+        """Returns the current item of the wrapped iterator."""
+        return self.list_it.peek()
+
+    def has_next(self):
+        """Whether the wrapped iterator has items left."""
+        return self.list_it.has_next()
+
+    def reset(self):
+        """Resets the wrapped iterator to the start of the list."""
+        self.list_it.reset()
+
+    def seek(self, index):
+        """Moves the wrapped iterator to index; nothing to record."""
+        self.list_it.seek(index)
+
+    def add_here(self, new_item):
+        """
+        Adds new_item before the current item, and records it.
+        """
+        position = self.list_it.position
+        self.list_it.add_here(new_item)
+        self.journal.record_add(position, new_item)
+
+    def splice(self, items):
+        """
+        Adds the items before the current item, and records them.
+        """
+        items = list(items)
+        position = self.list_it.position
+        count = self.list_it.splice(items)
+        self.journal.record_adds(position, items)
+        return count
+
+    def delete(self):
+        """
+        Deletes the current item, and records it.
+        """
+        position = self.list_it.position
+        item = self.list_it.delete()
+        self.journal.record_delete(position)
+        return item
+
+
+## REGRESSION TESTING CODE
+
+def test_replay():
+    """Edits a buffer through a JournalingIterator, then replays the
+    journal on a fresh copy of the original, including after a crash
+    that cut the last record short.
+    """
+    import tempfile
+    from unsorted_linked_list import UnsortedLinkedList
+    print("TESTING Journal.replay()")
+    file_name = os.path.join(tempfile.mkdtemp(), "journal_test.txt")
+    original = ["zero", "one", "two"]
+
+    def load():
+        list_it = iter(UnsortedLinkedList())
+        for line in original:
+            list_it.add_here(line)
+        return list_it
+
+    journal = Journal(file_name)
+    list_it = JournalingIterator(load(), journal)
+    list_it.seek(1)
+    list_it.delete()
+    list_it.add_here("uno")
+    list_it.seek(3)
+    list_it.add_here('"three"')
+    list_it.splice(["four", "five"])
+    journal.close()
+
+    replayed_it = load()
+    print("Expected 5 records, got ", Journal(file_name).replay(replayed_it))
+    print("Expected", list_it.linked_list, ", got ", replayed_it.linked_list)
+
+    with open(journal.journal_name, "a", encoding="utf-8") as f:
+        f.write("+0 \"cut sh")
+    replayed_it = load()
+    print("Expected 5 records, got ", Journal(file_name).replay(replayed_it))
+    print("Expected", list_it.linked_list, ", got ", replayed_it.linked_list)
+
+    # A damaged record in the middle is reported, and nothing is dropped
+    with open(journal.journal_name, "r", encoding="utf-8") as f:
+        lines = f.readlines()
+    lines.insert(3, "?garbage\n")
+    with open(journal.journal_name, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    try:
+        Journal(file_name).replay(load())
+        print("Expected an exception, but something went wrong")
+    except ValueError as error:
+        print("Expected: <class 'ValueError'> : ... record 3 is damaged ...")
+        print("Got     : ", type(error), ": ", error)
+    with open(journal.journal_name, "r", encoding="utf-8") as f:
+        print("Expected 7 lines kept, got ", len(f.readlines()))
+    journal.clear()
+    print("Expected False, got ", journal.exists())
+    os.rmdir(os.path.dirname(file_name))
+
+def test_stale():
+    """A crash after saving the file but before clearing the journal
+    leaves a journal of edits already in the file: it must not be
+    replayed.
+    """
+    import tempfile
+    from unsorted_linked_list import UnsortedLinkedList
+    print("TESTING Journal.is_stale()")
+    file_name = os.path.join(tempfile.mkdtemp(), "stale_test.txt")
+    with open(file_name, "w") as f:
+        f.write("zero\n")
+    journal = Journal(file_name)
+    list_it = JournalingIterator(iter(UnsortedLinkedList()), journal)
+    list_it.add_here("zero")
+    list_it.add_here("one")
+    journal.close()
+    print("Expected False, got ", Journal(file_name).is_stale())
+
+    # The edits are saved, as write_to_file does, then the editor crashes
+    with open(file_name + ".tmp", "w") as f:
+        f.write("zero\none\n")
+    os.replace(file_name + ".tmp", file_name)
+    journal = Journal(file_name)
+    print("Expected True, got ", journal.is_stale())
+    stale_name = journal.set_aside()
+    print("Expected False True, got ", journal.exists(),
+          os.path.exists(stale_name))
+    os.remove(stale_name)
+    os.remove(file_name)
+    os.rmdir(os.path.dirname(file_name))
+
+
+if __name__ == "__main__":
+    test_replay()
+    test_stale()
@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+
+"""
+Interning of the lines read into the prac6 editor's buffer.
+
+Text often repeats whole lines: blank lines, separators, the same log
+message over and over. Read in as they are, each copy is a string of its
+own. A LineInterner keeps one canonical string for every distinct line it
+has seen, and hands that back for every later copy, so that identical
+lines in the buffer share one object.
+
+The interner is bounded: once it holds limit distinct lines it stops
+taking in new ones, and lines it has not seen are kept as they are. The
+lines most worth sharing, such as blank lines, tend to turn up early.
+
+memory_usage() measures, for any buffer, how many of its lines share
+their string and how many bytes that saves.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  none
+@knownBugs      buffers that do not keep lines as strings of their own
+                (a piece table reading a file, a compressed buffer) gain
+                nothing from interning
+"""
+
+import sys
+
+# How many distinct lines an interner keeps, if not told
+DEFAULT_LIMIT = 65536
+
+
+class LineInterner:
+    """
+    A bounded dictionary of canonical line strings.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT):
+        """
+        @param      limit: the most distinct lines to keep
+        @complexity O(1)
+        """
+        self.limit = limit
+        self.canonical = {}
+        self.seen = 0
+        self.shared = 0
+
+    def intern(self, line):
+        """
+        @return     the canonical string equal to line, which is line itself
+                    if it is new (or the interner is full)
+        @complexity expected O(L), for a line of L characters, to hash it
+        """
+        self.seen += 1
+        canonical = self.canonical.get(line)
+        if canonical is not None:
+            self.shared += 1
+            return canonical
+        if len(self.canonical) < self.limit:
+            self.canonical[line] = line
+        return line
+
+    def intern_all(self, lines):
+        """
+        @return     generator of the canonical strings of an iterable of
+                    lines, in order
+        """
+        intern = self.intern
+        for line in lines:
+            yield intern(line)
+
+
+def memory_usage(items):
+    """
+    Measures how the strings of a buffer share memory.
+
+    @param      items: iterable of the buffer's lines
+    @return     dictionary of the number of lines, of distinct strings
+                (objects) and of distinct texts among them, the bytes the
+                lines would take as a string each and the bytes they take,
+                and the bytes saved by sharing
+    @complexity O(N) expected, for N lines
+    """
+    lines = 0
+    unshared = 0
+    # Keep every string alive until the end: a buffer that makes its lines
+    # as it goes (a compressed one) would otherwise let a freed string's id
+    # be reused by the next, and count two strings as one
+    objects = {}
+    texts = set()
+    for item in items:
+        lines += 1
+        unshared += sys.getsizeof(item)
+        objects[id(item)] = item
+        texts.add(item)
+    used = sum(sys.getsizeof(item) for item in objects.values())
+    return {
+        "lines": lines,
+        "strings": len(objects),
+        "unique": len(texts),
+        "unshared_bytes": unshared,
+        "bytes": used,
+        "saved_bytes": unshared - used,
+    }
+
+
+## REGRESSION TESTING CODE
+
+def test_intern():
+    """Copies of a line come back as the first one, until the interner is
+    full, after which new lines are kept as they are.
+    """
+    print("TESTING LineInterner")
+    interner = LineInterner(limit=2)
+    lines = ["".join(["a", "b"]), "".join(["a", "b"]), "", "c" * 3,
+             "".join(["c"] * 3)]
+    interned = list(interner.intern_all(lines))
+    print("Expected True, got ", interned[1] is interned[0])
+    print("Expected False, got ", interned[4] is interned[3])
+    print("Expected 5 seen, 1 shared, got ", interner.seen, "seen,",
+          interner.shared, "shared")
+
+def test_memory_usage():
+    """Shared strings are counted once; equal but separate ones are not."""
+    print("TESTING memory_usage()")
+    line = "".join(["x"] * 100)
+    usage = memory_usage([line, line, "".join(["x"] * 100)])
+    print("Expected 3 lines, 2 strings, 1 unique, got ", usage["lines"],
+          "lines,", usage["strings"], "strings,", usage["unique"], "unique")
+    print("Expected True, got ", usage["saved_bytes"] == sys.getsizeof(line))
+    # A compressed buffer makes a new string for each line it hands out
+    from compressed_list import CompressedList
+    list_it = iter(CompressedList(block_lines=4, cache_blocks=1))
+    list_it.splice("line {0}".format(i % 3) for i in range(40))
+    usage = memory_usage(list_it.linked_list)
+    print("Expected 40 lines, 40 strings, 3 unique, got ", usage["lines"],
+          "lines,", usage["strings"], "strings,", usage["unique"], "unique")
+
+
+if __name__ == "__main__":
+    test_intern()
+    test_memory_usage()
@@ -32,4 +32,26 @@ class Node:
         @complexity  best and worst case: O(1)
         """
         self.item = new_item
-        self.link = successor_node
\ No newline at end of file
+        self.link = successor_node
+
+
+class DoubleNode(Node):
+    """
+    Nodes of a doubly linked list, which also refer to their predecessor.
+    """
+
+    def __init__(self, new_item="", successor_node=None,
+                 predecessor_node=None):
+        """
+        Creates a new node, with the input new_item as data and linked
+        to the nodes successor_node and predecessor_node.
+
+        @param new_item to store in this node
+        @param successor_node refers to the successor node in the list
+        @param predecessor_node refers to the predecessor node in the list
+        @post  a node object is created with data new_item and linked
+               to successor_node and predecessor_node
+        @complexity  best and worst case: O(1)
+        """
+        Node.__init__(self, new_item, successor_node)
+        self.prev = predecessor_node
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+"""
+Searching the lines of a buffer for a regular expression on several
+processes at once, for buffers big enough that filter and find are
+bound by the time spent matching lines.
+
+The lines are split into contiguous chunks, each chunk is searched by a
+worker process of a ProcessPoolExecutor, and each worker sends back the
+positions of the lines that matched. The caller can then delete or print
+those lines in one more pass over the buffer.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  none
+@knownBugs      the lines are pickled to send them to the workers, which
+                costs time of its own; it pays off only when matching a
+                line costs more than copying it
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Chunks per worker, so that a worker with easy lines can take more chunks
+CHUNKS_PER_WORKER = 4
+
+# Worker pools, by number of workers, kept between searches
+_pools = {}
+
+
+def default_workers():
+    """
+    @return     the number of processors we can use
+    """
+    return os.cpu_count() or 1
+
+
+def get_pool(workers):
+    """
+    @return     a ProcessPoolExecutor with the given number of workers,
+                started on first use and reused after that
+    """
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = _pools[workers] = ProcessPoolExecutor(workers)
+    return pool
+
+
+def search_chunk(matcher, first, lines, invert=False):
+    """
+    Runs in a worker: searches a chunk of lines.
+
+    @param      matcher: compiled regular expression
+    @param      first: position of the first line of the chunk
+    @param      lines: the lines of the chunk
+    @param      invert: if true, report the lines that don't match instead
+    @return     list of the positions of the lines found
+    @complexity O(n*s), for n lines and s the cost of searching one
+    """
+    search = matcher.search
+    return [first + offset for offset, line in enumerate(lines)
+            if (search(line) is None) == invert]
+
+
+def matching_positions(lines, matcher, workers, invert=False):
+    """
+    Searches lines for matcher on workers processes.
+
+    @param      lines: list of the lines to search
+    @param      matcher: compiled regular expression
+    @param      workers: how many processes to search on
+    @param      invert: if true, report the lines that don't match instead
+    @return     sorted list of the positions of the lines found
+    @complexity O(n*s / workers) plus the cost of sending the lines over
+    """
+    chunk_size = max(1, -(-len(lines) // (workers * CHUNKS_PER_WORKER)))
+    pool = get_pool(workers)
+    futures = [pool.submit(search_chunk, matcher, first,
+                           lines[first:first + chunk_size], invert)
+               for first in range(0, len(lines), chunk_size)]
+    positions = []
+    for future in futures:
+        positions.extend(future.result())
+    return positions
+
+
+## REGRESSION TESTING CODE
+
+def test_matching_positions():
+    """Compares the parallel search with a plain one, both ways round."""
+    import re
+    print("TESTING matching_positions()")
+    lines = ["line {0}".format(i) for i in range(1000)]
+    matcher = re.compile("7")
+    expected = [i for i, line in enumerate(lines) if "7" in line]
+    print("Expected True, got ",
+          matching_positions(lines, matcher, 2) == expected)
+    expected = [i for i, line in enumerate(lines) if "7" not in line]
+    print("Expected True, got ",
+          matching_positions(lines, matcher, 3, invert=True) == expected)
+    print("Expected [], got ", matching_positions([], matcher, 2))
+
+
+if __name__ == "__main__":
+    test_matching_positions()
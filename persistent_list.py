@@ -0,0 +1,454 @@
+#!/usr/bin/python3
+
+"""
+This file implements a persistent list: every edit makes a new version of
+the list, and old versions stay valid, so the editor can undo and redo
+edits by switching between them.
+
+The items are kept in a treap (a binary search tree by position, balanced
+by random priorities) built out of immutable TreeNodes. An edit never
+changes a node. It copies the O(log N) nodes on the path to where the
+edit happens and shares every other node with the previous version. Each
+version kept for undo therefore costs memory in proportion to the size of
+the edits made since the last one, times log N, not to the size of the
+list.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past the end, LookupError when there is nothing
+                to undo or redo
+@knownBugs      none
+"""
+
+import random
+from collections import deque
+
+# How many versions undo() can go back by default
+DEFAULT_MAX_HISTORY = 100
+
+
+class TreeNode:
+    """
+    Immutable nodes of a treap. size is the number of nodes in the subtree
+    rooted here, which tells us the position of every node.
+    """
+
+    __slots__ = ("item", "priority", "left", "right", "size")
+
+    def __init__(self, item, priority, left=None, right=None):
+        """
+        @complexity  best and worst case: O(1)
+        """
+        self.item = item
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = 1 + size(left) + size(right)
+
+
+def size(node):
+    """
+    @return     the number of items in the tree rooted at node
+    @complexity best and worst case: O(1)
+    """
+    return 0 if node is None else node.size
+
+
+def merge(first, second):
+    """
+    @return     a tree holding the items of first followed by those of second
+    @complexity expected O(log N); copies the nodes along the path
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if first.priority > second.priority:
+        return TreeNode(first.item, first.priority, first.left,
+                        merge(first.right, second))
+    return TreeNode(second.item, second.priority,
+                    merge(first, second.left), second.right)
+
+
+def split(node, index):
+    """
+    @return     a pair of trees, the first holding the items before index
+                and the second the items from index on
+    @complexity expected O(log N); copies the nodes along the path
+    """
+    if node is None:
+        return None, None
+    if size(node.left) >= index:
+        first, second = split(node.left, index)
+        return first, TreeNode(node.item, node.priority, second, node.right)
+    first, second = split(node.right, index - size(node.left) - 1)
+    return TreeNode(node.item, node.priority, node.left, first), second
+
+
+class PersistentList:
+    """
+    A list of persistent versions, with undo and redo.
+
+    Invariants for the class:
+        (1) root is the tree of the current version, None if it is empty
+        (2) saved is the version last recorded by checkpoint()
+        (3) undo_stack holds the versions before saved, oldest first, and
+            redo_stack the versions undone since, most recently undone last
+    """
+
+    def __init__(self, size=None, max_history=DEFAULT_MAX_HISTORY):
+        """
+        Creates an empty list with no history.
+
+        Parameter `size` is included to provide compatibility with the
+        interface of the ArrayList, and then disregarded.
+
+        @param          max_history: how many versions undo() can go back
+        @post           an empty list object is created
+        @complexity     best and worst case: O(1)
+        """
+        self.root = None
+        self.saved = None
+        self.undo_stack = deque(maxlen=max_history)
+        self.redo_stack = []
+
+    def is_empty(self):
+        """
+        @return         false if list has elements, true if empty
+        @complexity     best and worst case: O(1)
+        """
+        return self.root is None
+
+    def __len__(self):
+        """
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return size(self.root)
+
+    def __bool__(self):
+        """
+        @return         true if list has elements, false if empty
+        @complexity     best and worst case: O(1)
+        """
+        return not self.is_empty()
+
+    def is_full(self):
+        """
+        Determines whether the list is full, which it never is.
+
+        @return     false
+        @complexity best and worst case: O(1)
+        """
+        return False
+
+    def reset(self):
+        """
+        Makes a new, empty version of the list. Like any other edit, this
+        can be undone once checkpointed.
+
+        @post           the list is empty
+        @complexity     best and worst case: O(1)
+        """
+        self.root = None
+
+    def insert(self, index, new_item):
+        """
+        Makes a new version with new_item at index.
+
+        @raises     IndexError if index is not in 0..len(list)
+        @complexity expected O(log N)
+        """
+        if index < 0 or index > len(self):
+            raise IndexError("list index out of range")
+        first, second = split(self.root, index)
+        new_node = TreeNode(new_item, random.random())
+        self.root = merge(merge(first, new_node), second)
+
+    def pop(self, index):
+        """
+        Makes a new version without the item at index.
+
+        @return     the item deleted
+        @raises     IndexError if index is not in 0..len(list) - 1
+        @complexity expected O(log N)
+        """
+        if index < 0 or index >= len(self):
+            raise IndexError("list index out of range")
+        first, rest = split(self.root, index)
+        deleted, second = split(rest, 1)
+        self.root = merge(first, second)
+        return deleted.item
+
+    def add_first(self, new_item):
+        """
+        Makes a new version with new_item as the first element.
+
+        @complexity     expected O(log N)
+        """
+        self.insert(0, new_item)
+
+    def add(self, new_item):
+        """
+        As for unsorted linked lists, "add()" is synonymous with "add_first()"
+        """
+        self.add_first(new_item)
+
+    def checkpoint(self):
+        """
+        Records the current version as a step undo() can go back to, if it
+        has changed since the last checkpoint. Any undone versions can no
+        longer be redone.
+
+        @complexity best and worst case: O(1)
+        """
+        if self.root is not self.saved:
+            self.undo_stack.append(self.saved)
+            self.saved = self.root
+            self.redo_stack = []
+
+    def undo(self):
+        """
+        Goes back to the version before the last checkpoint.
+
+        @raises     LookupError if there is nothing to undo
+        @complexity best and worst case: O(1)
+        """
+        self.checkpoint()
+        if not self.undo_stack:
+            raise LookupError("nothing to undo")
+        self.redo_stack.append(self.root)
+        self.root = self.saved = self.undo_stack.pop()
+
+    def redo(self):
+        """
+        Goes forward to the version undone last.
+
+        @raises     LookupError if there is nothing to redo
+        @complexity best and worst case: O(1)
+        """
+        if self.root is not self.saved or not self.redo_stack:
+            raise LookupError("nothing to redo")
+        self.undo_stack.append(self.root)
+        self.root = self.saved = self.redo_stack.pop()
+
+    class ListIterator:
+        """
+        Implements the same iterator interface as
+        UnsortedLinkedList.ListIterator over the current version of a
+        PersistentList.
+
+        For next() the iterator keeps a stack of the nodes still to visit
+        on the way to the end of the tree, as an in-order traversal does.
+        It is built again whenever the list moves to another version.
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the list, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.reset()
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        def _stack(self):
+            """
+            @return     the traversal stack for position in the current
+                        version, with the current node on top
+            @complexity O(1) if still valid, expected O(log N) to rebuild
+            """
+            root = self.linked_list.root
+            if self.stack is None or self.root is not root:
+                self.root = root
+                self.stack = []
+                node = root
+                index = self.position
+                while node is not None:
+                    left_size = size(node.left)
+                    if index < left_size:
+                        self.stack.append(node)
+                        node = node.left
+                    elif index == left_size:
+                        self.stack.append(node)
+                        break
+                    else:
+                        index -= left_size + 1
+                        node = node.right
+            return self.stack
+
+        def __next__(self):
+            """
+            Returns the current item and moves to the next one.
+
+            @return     the item at the cursor
+            @throws     StopIteration if there are no items left
+            @complexity amortised O(1) while the list stays on one version
+            """
+            stack = self._stack()
+            if not stack:
+                raise StopIteration("no more elements in list")
+            node = stack.pop()
+            child = node.right
+            while child is not None:
+                stack.append(child)
+                child = child.left
+            self.position += 1
+            return node.item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def peek(self):
+            """
+            Returns the current item without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(1) while the list stays on one version
+            """
+            stack = self._stack()
+            if not stack:
+                raise StopIteration("no more elements in list")
+            return stack[-1].item
+
+        def has_next(self):
+            """
+            @return     true if there is an element not yet iterated over
+            @complexity best and worst case: O(1)
+            """
+            return self.position < len(self.linked_list)
+
+        def reset(self):
+            """
+            Resets the iterator to point to the start of the list.
+
+            @complexity best and worst case: O(1)
+            """
+            self.position = 0
+            self.stack = None
+            self.root = None
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the item at index is the current one.
+
+            @raises     IndexError if index is not in 0..len(list)
+            @complexity O(1); the next call to next() or peek() finds the
+                        node in expected O(log N)
+            """
+            if index < 0 or index > len(self.linked_list):
+                raise IndexError("list index out of range")
+            self.position = index
+            self.stack = None
+
+        def add_here(self, new_item):
+            """
+            Makes a new version with new_item before the current item.
+
+            @complexity expected O(log N)
+            """
+            self.linked_list.insert(self.position, new_item)
+            self.position += 1
+            self.stack = None
+
+        def splice(self, items):
+            """
+            Makes a new version with every item of an iterable before the
+            current item, in order, one add_here() at a time.
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @complexity expected O(M log N), for M items
+            """
+            count = 0
+            for count, item in enumerate(items, 1):
+                self.add_here(item)
+            return count
+
+        def delete(self):
+            """
+            Makes a new version without the current item, and returns it.
+
+            @throws     StopIteration if there are no items left
+            @complexity expected O(log N)
+            """
+            if not self.has_next():
+                raise StopIteration("no more elements in list")
+            self.stack = None
+            return self.linked_list.pop(self.position)
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def __repr__(self):
+        """
+        @return     Unambiguous string representation of the current version
+        @complexity Best and worst case: O(N)
+        """
+        return " ".join(repr(item) for item in self)
+
+    __str__ = __repr__
+
+
+## REGRESSION TESTING CODE
+
+def test_iterator():
+    """Checks the iterator against a Python list after a long run of
+    random inserts, deletes and seeks.
+    """
+    print("TESTING ListIterator")
+    my_list = PersistentList()
+    reference = []
+    it = iter(my_list)
+    for step in range(2000):
+        index = random.randint(0, len(reference))
+        it.seek(index)
+        if reference and index < len(reference) and step % 3 == 0:
+            it.delete()
+            del reference[index]
+        else:
+            it.add_here(step)
+            reference.insert(index, step)
+    it.reset()
+    print("Expected True, got ", list(it) == reference)
+
+def test_undo_redo():
+    """Undoes and redoes a few checkpointed edits, and checks that an edit
+    after undoing drops the versions that could be redone.
+    """
+    print("TESTING undo() and redo()")
+    my_list = PersistentList()
+    it = iter(my_list)
+    for item in ["a", "b", "c"]:
+        it.add_here(item)
+        my_list.checkpoint()
+    my_list.undo()
+    my_list.undo()
+    print("Expected 'a', got ", my_list)
+    my_list.redo()
+    print("Expected 'a' 'b', got ", my_list)
+    it.seek(0)
+    it.delete()
+    my_list.checkpoint()
+    print("Expected 'b', got ", my_list)
+    try:
+        my_list.redo()
+        print("Expected an exception, but something went wrong")
+    except LookupError as error:
+        print("Expected: <class 'LookupError'> : nothing to redo")
+        print("Got     : ", type(error), ": ", error)
+    my_list.undo()
+    print("Expected 'a' 'b', got ", my_list)
+
+
+if __name__ == "__main__":
+    test_iterator()
+    test_undo_redo()
@@ -0,0 +1,583 @@
+#!/usr/bin/python3
+
+"""
+This file implements a piece table, an alternative to the linked list as
+the buffer of the prac6 text editor.
+
+Instead of one node per line, a piece table keeps the text it was loaded
+from as read-only line buffers, plus one append-only buffer for every line
+added afterwards. The buffer's contents are described by a table of pieces,
+each one a span of consecutive lines in one of those buffers. Loading a
+file is one piece, and inserting or deleting lines only splits, trims or
+adds pieces, so editing costs O(pieces) rather than O(lines).
+
+A piece table created with lazy=True goes further and memory-maps the
+files it reads, only decoding a line when it is looked at. Lines that are
+not edited are never copied into Python strings, and write_to() streams
+them out of the mapping in large chunks.
+
+@since          18 October 2026
+@input          the files read into the buffer
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past the end
+@knownBugs      none
+"""
+
+import locale
+import mmap
+import os
+from array import array
+
+# How many lines write_to() decodes and writes at a time
+CHUNK_LINES = 4096
+
+
+class LineBuffer:
+    """
+    Read-only lines of a text, kept as one string plus the offsets where
+    each line starts, so no per-line string exists until one is asked for.
+    """
+
+    def __init__(self, text, newline="\n"):
+        """
+        Indexes the lines of text in one pass.
+
+        @param      text to split into lines at each newline, a str or
+                    anything bytes-like with find(), like an mmap
+        @param      newline: the line separator, of the same type as text
+        @post       starts[i] is the offset of line i, and the offset past
+                    the newline ending the last line is kept at the end
+        @complexity best and worst case: O(N), where N is the number of
+                    lines in the text
+        """
+        self.text = text
+        starts = array("q", [0])
+        pos = text.find(newline)
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find(newline, pos + 1)
+        if starts[-1] != len(text):
+            # The last line has no newline, pretend it has one
+            starts.append(len(text) + 1)
+        self.starts = starts
+
+    @classmethod
+    def from_file(cls, file_name):
+        """
+        Reads the whole of a text file into a new LineBuffer.
+
+        @raises     IOError if the file can't be read
+        @complexity O(N), where N is the size of the file
+        """
+        with open(file_name, "r") as f:
+            return cls(f.read())
+
+    def __len__(self):
+        """
+        @return     the number of lines in the buffer
+        @complexity best and worst case: O(1)
+        """
+        return len(self.starts) - 1
+
+    def __getitem__(self, index):
+        """
+        @return     line number index (from 0) without its newline
+        @complexity O(L), where L is the length of the line
+        """
+        return self.text[self.starts[index]:self.starts[index + 1] - 1]
+
+    def text_of(self, start, stop):
+        """
+        @return     lines start to stop - 1 as one string, each of them
+                    ending in a newline
+        @complexity O(L), where L is the length of the text returned
+        """
+        text = self.text[self.starts[start]:self.starts[stop]]
+        if self.starts[stop] > len(self.text):
+            text += "\n"
+        return text
+
+
+class MappedLineBuffer(LineBuffer):
+    """
+    Read-only lines of a file that is memory-mapped rather than read in.
+    Only the array of line offsets is built up front; lines are decoded
+    when they are asked for.
+
+    Lines are split at "\n" and a "\r" before it is dropped, so files with
+    Windows line endings read the same as they do through open().
+    """
+
+    def __init__(self, file_name):
+        """
+        Maps file_name into memory and indexes its lines in one pass.
+
+        @raises     IOError if the file can't be opened
+        @complexity O(N) to find the newlines, where N is the size of the
+                    file; nothing is decoded
+        """
+        self.file_name = file_name
+        self.encoding = locale.getpreferredencoding(False)
+        with open(file_name, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                mapping = b""   # mmap refuses to map empty files
+            else:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        LineBuffer.__init__(self, mapping, b"\n")
+        self.crlf = mapping.find(b"\r\n") != -1
+
+    def __getitem__(self, index):
+        """
+        @return     line number index (from 0), decoded, without its newline
+        @complexity O(L), where L is the length of the line
+        """
+        line = self.text[self.starts[index]:self.starts[index + 1] - 1]
+        if self.crlf and line.endswith(b"\r"):
+            line = line[:-1]
+        return line.decode(self.encoding)
+
+    def text_of(self, start, stop):
+        """
+        @return     lines start to stop - 1, decoded as one string, each of
+                    them ending in a newline
+        @complexity O(L), where L is the length of the text returned
+        """
+        data = self.text[self.starts[start]:self.starts[stop]]
+        if self.starts[stop] > len(self.text):
+            data += b"\n"
+        text = data.decode(self.encoding)
+        if self.crlf:
+            text = text.replace("\r\n", "\n")
+        return text
+
+
+class Piece:
+    """
+    A span of length consecutive lines of source, from line start on.
+    """
+
+    __slots__ = ("source", "start", "length")
+
+    def __init__(self, source, start, length):
+        self.source = source
+        self.start = start
+        self.length = length
+
+    def __repr__(self):
+        return "Piece({0!r}, {1}, {2})".format(
+            type(self.source).__name__, self.start, self.length)
+
+
+class PieceTableBuffer:
+    """
+    A list of lines stored as a piece table.
+
+    Invariants for the class:
+        (1) reading the lines of every piece in pieces, in order, gives the
+            contents of the list
+        (2) no piece is empty
+        (3) added only ever grows, so pieces pointing into it stay valid
+        (4) length is the sum of the lengths of the pieces
+    """
+
+    def __init__(self, size=None, lazy=False):
+        """
+        Creates an empty piece table.
+
+        Parameter `size` is included to provide compatibility with the
+        interface of the ArrayList, and then disregarded.
+
+        @param          lazy: if true, files are memory-mapped rather than
+                        read into memory
+        @post           an empty list object is created
+        @complexity     best and worst case: O(1)
+        """
+        self.lazy = lazy
+        self.reset()
+
+    def is_empty(self):
+        """
+        @return         false if list has elements, true if empty
+        @complexity     best and worst case: O(1)
+        """
+        return self.length == 0
+
+    def __len__(self):
+        """
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return self.length
+
+    def __bool__(self):
+        """
+        @return         true if list has elements, false if empty
+        @complexity     best and worst case: O(1)
+        """
+        return not self.is_empty()
+
+    def is_full(self):
+        """
+        Determines whether the list is full, which it never is.
+
+        @return     false
+        @complexity best and worst case: O(1)
+        """
+        return False
+
+    def reset(self):
+        """
+        Resets the list to an empty state, dropping all buffers.
+
+        @post           the list is empty
+        @complexity     best and worst case: O(1)
+        """
+        self.added = []
+        self.pieces = []
+        self.length = 0
+
+    def add_first(self, new_item):
+        """
+        Adds new_item as the first element of the list.
+
+        @param          new_item to add to this list
+        @post           list[0] equals new_item after the method is called
+        @complexity     O(P), where P is the number of pieces
+        """
+        self.ListIterator(self).add_here(new_item)
+
+    def add(self, new_item):
+        """
+        As for unsorted linked lists, "add()" is synonymous with "add_first()"
+        """
+        self.add_first(new_item)
+
+    def write_to(self, stream, chunk_lines=CHUNK_LINES):
+        """
+        Writes every line of the buffer to stream, each ending in a newline.
+
+        Lines are written chunk_lines at a time, and those still in a file
+        buffer are sliced out of it (or its mapping) as one block of text
+        per chunk, rather than line by line.
+
+        @param      stream: a text stream to write to
+        @param      chunk_lines: how many lines to write at a time
+        @return     the number of lines written
+        @post       the buffer is unchanged
+        @complexity O(N), where N is the size of the text
+        """
+        count = 0
+        for piece in self.pieces:
+            source = piece.source
+            stop = piece.start + piece.length
+            count += piece.length
+            for start in range(piece.start, stop, chunk_lines):
+                end = min(start + chunk_lines, stop)
+                if isinstance(source, LineBuffer):
+                    stream.write(source.text_of(start, end))
+                else:
+                    stream.write("\n".join(source[start:end]) + "\n")
+        return count
+
+    class ListIterator:
+        """
+        Implements the same iterator interface as
+        UnsortedLinkedList.ListIterator over a piece table.
+
+        The cursor is kept as the index of a piece and an offset into it,
+        with piece == len(pieces) and offset == 0 once we are past the end.
+        The buffer is kept in an attribute called linked_list, like the
+        other iterators, so the editor can use any of them.
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the buffer, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.reset()
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        def __next__(self):
+            """
+            Returns the current item and moves to the next one.
+
+            @return     the item at the cursor
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            pieces = self.linked_list.pieces
+            if self.piece >= len(pieces):
+                raise StopIteration("no more elements in list")
+            piece = pieces[self.piece]
+            item = piece.source[piece.start + self.offset]
+            self.offset += 1
+            if self.offset == piece.length:
+                self.piece += 1
+                self.offset = 0
+            self.position += 1
+            return item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def peek(self):
+            """
+            Returns the current item without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            pieces = self.linked_list.pieces
+            if self.piece >= len(pieces):
+                raise StopIteration("no more elements in list")
+            piece = pieces[self.piece]
+            return piece.source[piece.start + self.offset]
+
+        def has_next(self):
+            """
+            @return     true if there is an element not yet iterated over
+            @complexity best and worst case: O(1)
+            """
+            return self.piece < len(self.linked_list.pieces)
+
+        def reset(self):
+            """
+            Resets the iterator to point to the start of the buffer.
+
+            @complexity best and worst case: O(1)
+            """
+            self.piece = 0
+            self.offset = 0
+            self.position = 0
+
+        def walked(self, steps):
+            """
+            Called by seek() with the number of pieces it stepped over.
+            Does nothing: stats.enable_counters() replaces it to count them.
+            """
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the item at index is the current one.
+
+            Seeking forwards skips whole pieces from where we are; seeking
+            backwards starts again from the first piece.
+
+            @param      index of the item to move to, from 0 to len(list)
+            @raises     IndexError if index is out of range
+            @complexity O(P), where P is the number of pieces
+            """
+            if index < 0 or index > self.linked_list.length:
+                raise IndexError("list index out of range")
+            if index < self.position:
+                self.reset()
+            pieces = self.linked_list.pieces
+            # Index of the first line of the current piece
+            first = self.position - self.offset
+            piece = self.piece
+            while piece < len(pieces) and first + pieces[piece].length <= index:
+                first += pieces[piece].length
+                piece += 1
+            self.walked(piece - self.piece)
+            self.piece = piece
+            self.offset = index - first
+            self.position = index
+
+        def _split_here(self):
+            """
+            Splits the current piece at the cursor, so that the cursor is at
+            the start of a piece (or past the end).
+
+            @complexity O(P), where P is the number of pieces
+            """
+            if self.offset > 0:
+                pieces = self.linked_list.pieces
+                piece = pieces[self.piece]
+                tail = Piece(piece.source, piece.start + self.offset,
+                             piece.length - self.offset)
+                piece.length = self.offset
+                self.piece += 1
+                self.offset = 0
+                pieces.insert(self.piece, tail)
+
+        def add_piece(self, source, start, length):
+            """
+            Adds length lines of source, from line start on, between the
+            previous item and the current one.
+
+            @post       the iterator is still pointing at the same current
+                        item, which is now after the added lines
+            @complexity O(P), where P is the number of pieces
+            """
+            if length == 0:
+                return
+            self._split_here()
+            pieces = self.linked_list.pieces
+            before = pieces[self.piece - 1] if self.piece > 0 else None
+            if before is not None and before.source is source and \
+                    before.start + before.length == start:
+                # Lines typed one after the other extend the same piece
+                before.length += length
+            else:
+                pieces.insert(self.piece, Piece(source, start, length))
+                self.piece += 1
+            self.linked_list.length += length
+            self.position += length
+
+        def add_here(self, new_item):
+            """
+            Adds an item to the list, before the current one.
+
+            @param      new_item: item to be added
+            @post       new_item is in the list just before the current item
+            @complexity O(1) when adding after the last added item, otherwise
+                        O(P), where P is the number of pieces
+            """
+            added = self.linked_list.added
+            added.append(new_item)
+            self.add_piece(added, len(added) - 1, 1)
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable before the current one, in order,
+            as one piece of the added items.
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @complexity O(M + P), for M items and P pieces
+            """
+            added = self.linked_list.added
+            start = len(added)
+            added.extend(items)
+            self.add_piece(added, start, len(added) - start)
+            return len(added) - start
+
+        def add_file(self, file_name):
+            """
+            Adds every line of a text file before the current item, keeping
+            the file's text as a read-only buffer of its own, or mapping it
+            if the buffer is lazy.
+
+            @raises     IOError if the file can't be read
+            @complexity O(N) to index the lines of the file, and O(P) to add
+                        its piece
+            """
+            if self.linked_list.lazy:
+                source = MappedLineBuffer(file_name)
+            else:
+                source = LineBuffer.from_file(file_name)
+            self.add_piece(source, 0, len(source))
+
+        def delete(self):
+            """
+            Returns the current item, deletes it, moves to the next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(P), where P is the number of pieces
+            """
+            pieces = self.linked_list.pieces
+            if self.piece >= len(pieces):
+                raise StopIteration("no more elements in list")
+            piece = pieces[self.piece]
+            item = piece.source[piece.start + self.offset]
+            if piece.length == 1:
+                del pieces[self.piece]
+            elif self.offset == 0:
+                piece.start += 1
+                piece.length -= 1
+            elif self.offset == piece.length - 1:
+                piece.length -= 1
+                self.piece += 1
+                self.offset = 0
+            else:
+                tail = Piece(piece.source, piece.start + self.offset + 1,
+                             piece.length - self.offset - 1)
+                piece.length = self.offset
+                self.piece += 1
+                self.offset = 0
+                pieces.insert(self.piece, tail)
+            self.linked_list.length -= 1
+            return item
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def __repr__(self):
+        """
+        @return     Unambiguous string representation of the list
+        @complexity Best and worst case: O(N)
+        """
+        return " ".join(repr(item) for item in self)
+
+    __str__ = __repr__
+
+
+## REGRESSION TESTING CODE
+
+def test_line_buffer():
+    """Three cases: empty text, text ending in a newline, and text with an
+    unterminated last line.
+    """
+    print("TESTING LineBuffer")
+    print("Expected [], got ", list(LineBuffer("")))
+    print("Expected ['a', '', 'b'], got ", list(LineBuffer("a\n\nb\n")))
+    print("Expected ['a', 'b'], got ", list(LineBuffer("a\nb")))
+
+def test_add_delete():
+    """Adds and deletes at the start, middle and end of pieces, and checks
+    the result against a Python list.
+    """
+    print("TESTING add_here() and delete()")
+    my_list = PieceTableBuffer()
+    it = iter(my_list)
+    it.add_piece(LineBuffer("0\n1\n2\n3\n4\n5\n"), 0, 6)
+    reference = ["0", "1", "2", "3", "4", "5"]
+    for index, item in [(0, "a"), (3, "b"), (4, "c"), (9, "d")]:
+        it.seek(index)
+        it.add_here(item)
+        reference.insert(index, item)
+    for index in [0, 4, 5, 5]:
+        it.seek(index)
+        it.delete()
+        del reference[index]
+    print("Expected", " ".join(repr(line) for line in reference),
+          ", got ", my_list)
+    print("Expected length", len(reference), ", got ", len(my_list))
+    print("Pieces:", my_list.pieces)
+
+def test_lazy():
+    """Reads a file with Windows line endings lazily, edits it and writes
+    it out, checking lines come out as they would through open().
+    """
+    import io
+    import tempfile
+    print("TESTING lazy reading")
+    with tempfile.NamedTemporaryFile("wb", suffix=".txt",
+                                     delete=False) as f:
+        f.write(b"one\r\ntwo\r\nthree")
+    my_list = PieceTableBuffer(lazy=True)
+    it = iter(my_list)
+    it.add_file(f.name)
+    it.seek(1)
+    it.add_here("one and a half")
+    out = io.StringIO()
+    my_list.write_to(out)
+    print("Expected 'one' 'one and a half' 'two' 'three', got ", my_list)
+    print("Expected 'one\\none and a half\\ntwo\\nthree\\n', got ",
+          repr(out.getvalue()))
+    os.remove(f.name)
+
+
+if __name__ == "__main__":
+    test_line_buffer()
+    test_add_delete()
+    test_lazy()
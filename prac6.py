@@ -12,12 +12,59 @@ Solution to a prac to give students experience using linked lists to implement a
 @known_bugs         None
 """
 
+import argparse
 import os
-
-from unsorted_linked_list import UnsortedLinkedList
-
-
-def main():
+import re
+import stat
+import sys
+import tempfile
+import time
+from collections import deque
+from itertools import islice
+
+from unsorted_linked_list import CHUNK_LINES, UnsortedLinkedList
+from doubly_linked_list import DoublyLinkedList
+from pooled_list import PooledList
+from skip_list import SkipList
+from piece_table import PieceTableBuffer
+from unrolled_linked_list import UnrolledLinkedList
+from persistent_list import PersistentList
+from compressed_list import CompressedList
+from journal import Journal, JournalingIterator
+from word_index import WORD, words_of
+from parallel_search import matching_positions
+from stats import CommandStats, enable_counters
+from line_intern import LineInterner, memory_usage
+
+# The list implementations the editor can keep its buffer in, by the name
+# used to choose them from the command line.
+BUFFER_TYPES = {
+    "linked": UnsortedLinkedList,
+    "doubly": DoublyLinkedList,
+    "pooled": PooledList,
+    "skiplist": SkipList,
+    "piecetable": PieceTableBuffer,
+    "unrolled": UnrolledLinkedList,
+    "persistent": PersistentList,
+    "compressed": CompressedList,
+}
+
+# How many lines tail prints if not told
+TAIL_LINES = 10
+
+# The process's umask, which can only be read by setting it. It is read
+# once here, before any thread (such as the buffer server's) can be
+# creating files while it is changed.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+# Size in bytes of the buffer write_to_file() batches its output in
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def main(buffer_type="linked", lazy=False, journal_file=None,
+         word_index=False, collect_stats=False, stats_file=None,
+         script=None, intern_lines=False):
     """
     A simple command-line driven text editor.
 
@@ -25,6 +72,24 @@ def main():
     @modified   Jerry Lu
     @modified   Jeffrey Dowdle
     @since      2 September 2013
+    @param      buffer_type: name in BUFFER_TYPES of the list implementation
+                to hold the buffer in.
+    @param      lazy: if true, the buffer is a piece table that maps the
+                files it reads instead of reading them in.
+    @param      journal_file: if given, this file is read in, any journal
+                left next to it is replayed, and every edit is journaled
+                until the file is written again or compacted.
+    @param      word_index: if true, keep an index of the words in the
+                buffer for find and filter -w (linked buffers only).
+    @param      collect_stats: if true, time every command and count the
+                nodes it traverses and allocates, for the stats command.
+    @param      stats_file: if given, collect statistics and write them to
+                this file as JSON on quitting.
+    @param      script: if given, a file to read commands from instead of
+                the console, without printing the menu or prompts. The
+                editor quits at its end and prints a summary of the run.
+    @param      intern_lines: if true, lines read, inserted or appended
+                share one string with any identical line seen before.
     @input      the commands to execute.
     @raises     Exception: when functions called cannot perform action
     @raises     ValueError: if line number is not an integer
@@ -40,48 +105,126 @@ def main():
 
     """
 
-    my_list = UnsortedLinkedList()
+    if lazy:
+        my_list = PieceTableBuffer(lazy=True)
+    else:
+        my_list = BUFFER_TYPES[buffer_type]()
+    if word_index:
+        if hasattr(my_list, "enable_word_index"):
+            my_list.enable_word_index()
+        else:
+            print("The word index needs --buffer linked or doubly; "
+                  "not indexing.")
     list_it = iter(my_list)
     quit = False
     input_line = None
 
+    interner = LineInterner() if intern_lines else None
+
+    journal = None
+    if journal_file is not None:
+        list_it, journal = open_journal(list_it, journal_file, interner)
+
+    command_stats = None
+    if collect_stats or stats_file is not None:
+        enable_counters()
+        command_stats = CommandStats()
+
+    if script is not None:
+        script_counts = {}
+        script_start = time.perf_counter()
+
     # Command parsing loop
     while not quit:
         # Read a command
-        try:
-            print("Possible commands: 'printall' 'pwd' 'test' 'quit' 'write $filename' 'read $filename' 'delete $line' 'append' 'insert $line' 'print $line' 'filter <word>'")
-            input_line = input("Enter your command: ")
-        except IOError as e:
-            print("Error reading from console or EOF character")
-            input_line = ""
+        if script is not None:
+            input_line = script.readline()
+            if not input_line:
+                # The end of the script
+                input_line = "quit"
+            input_line = input_line.rstrip("\n")
+            if not input_line.strip() or input_line.startswith("#"):
+                continue
+        else:
+            try:
+                print("Possible commands: 'printall [n]' 'pwd' 'test' 'quit' 'write $filename [$first..$last]' 'read $filename' 'delete $line[..$last]' 'append' 'insert $line' 'print $line[..$last]' 'filter [-v] [-i] [-w] [-r] [-j n] <word>...' 'find [-j n] <word>' 'rfind <word> [n]' 'tail [n]' 'compact' 'undo' 'redo' 'stats' 'memory'")
+                input_line = input("Enter your command: ")
+            except IOError as e:
+                print("Error reading from console or EOF character")
+                input_line = ""
 
         command = input_line.split(" ")
+        if script is not None:
+            script_counts[command[0]] = script_counts.get(command[0], 0) + 1
+        if command_stats is not None:
+            command_stats.start()
 
         if command[0] == "write":
-            write_to_file(list_it, command[1])
+            try:
+                line_range = parse_range(command[2]) \
+                    if len(command) > 2 else None
+                saved = write_to_file(list_it, command[1],
+                                      line_range=line_range)
+            except ValueError:
+                print("Line numbers need to be integers.")
+                saved = False
+            if saved and line_range is None and journal is not None and \
+                    os.path.abspath(command[1]) == \
+                    os.path.abspath(journal.file_name):
+                # The journaled edits are in the file now
+                journal.clear()
+        elif command[0] == "compact":
+            if hasattr(my_list, "compact"):
+                # Renumber the buffer's slots in list order
+                position = list_it.position
+                my_list.compact()
+                list_it.reset()
+                list_it.seek(position)
+                print("Buffer compacted.")
+            if journal is not None:
+                if write_to_file(list_it, journal.file_name):
+                    journal.clear()
+            elif not hasattr(my_list, "compact"):
+                print("Not journaling; start with --journal $filename.")
         elif command[0] == "read":
-            read_from_file(list_it, command[1])
+            read_from_file(list_it, command[1], interner)
         elif command[0] == "printall":
-            printall(list_it)
+            try:
+                page_lines = int(command[1]) if len(command) > 1 else None
+                if page_lines is not None and page_lines < 1:
+                    raise ValueError("printall needs a number of lines.")
+                printall(list_it, page_lines,
+                         ask_more if script is None else None)
+            except ValueError:
+                print("Number of lines needs to be a positive integer.")
         elif command[0] == "print":
             try:
-                print_n(list_it, int(command[1]))
+                line_range = parse_range(command[1])
+                if line_range is None:
+                    print_n(list_it, int(command[1]))
+                else:
+                    print_range(list_it, *line_range)
             except ValueError as e:
                 print("Line number needs to be an integer.")
             except Exception as e:
                 print("Exception:", e)
         elif command[0] == "delete":
             try:
-                delete_n(list_it, int(command[1]))
+                line_range = parse_range(command[1])
+                if line_range is None:
+                    delete_n(list_it, int(command[1]))
+                else:
+                    delete_range(list_it, *line_range)
             except ValueError as e:
                 print("Line number needs to be an integer.")
             except Exception as e:
                 print("Exception:", e)
         elif command[0] == "append":
-            print("Append: ")
-            append_data = multi_line_input()
+            if script is None:
+                print("Append: ")
+            append_data = multi_line_input(script)
             # print(append_data)
-            append(list_it, append_data)
+            append(list_it, append_data, interner)
         elif command[0] == "insert":
             # check if n is negative
             try:
@@ -90,24 +233,123 @@ def main():
                 if not validate_line_number(list_it, n) and n != 0:
                     raise Exception("Line number out of range.")
 
-                print("Insert: ")
-                insert_data = multi_line_input()
-                insert(list_it, insert_data, n)
+                if script is None:
+                    print("Insert: ")
+                insert_data = multi_line_input(script)
+                insert(list_it, insert_data, n, interner)
             except ValueError:
                 print("Line number needs to be an integer.")
             except Exception as e:
                 print("Exception:", e)
         elif command[0] == 'filter':
-            string = str(command[1])
-            filter_word(list_it, string)
+            try:
+                filter_command(list_it, command[1:])
+            except (ValueError, re.error) as e:
+                print("Exception:", e)
+        elif command[0] == "find":
+            try:
+                _, workers, args = parse_options(command[1:], ())
+                if len(args) != 1:
+                    raise ValueError("find needs one word.")
+                find_word(list_it, args[0], workers)
+            except ValueError as e:
+                print("Exception:", e)
+        elif command[0] == "tail":
+            try:
+                n = int(command[1]) if len(command) > 1 else TAIL_LINES
+                if n < 0:
+                    raise ValueError("tail needs a number of lines.")
+                print_tail(list_it, n)
+            except ValueError:
+                print("Number of lines needs to be a positive integer.")
+        elif command[0] == "rfind":
+            try:
+                if len(command) not in (2, 3):
+                    raise ValueError("rfind needs a word.")
+                count = int(command[2]) if len(command) == 3 else 1
+                if count < 1:
+                    raise ValueError("rfind needs a positive count.")
+                rfind_word(list_it, command[1], count)
+            except ValueError as e:
+                print("Exception:", e)
+        elif command[0] in ("undo", "redo"):
+            if not hasattr(my_list, "undo"):
+                print("Undo needs --buffer persistent.")
+            elif journal is not None:
+                print("Can't undo while journaling; compact first.")
+            else:
+                try:
+                    getattr(my_list, command[0])()
+                    list_it.reset()
+                except LookupError as e:
+                    print("Exception:", e)
+        elif command[0] == "stats":
+            if command_stats is None:
+                print("Not collecting statistics; start with --stats.")
+            else:
+                command_stats.report()
+        elif command[0] == "memory":
+            print_memory(list_it, interner)
         elif command[0] == "test":
             run_tests()
         elif command[0] == "quit":
             quit = True
+            if journal is not None:
+                journal.close()
         else:
             print("Unrecognized command or not enough arguments.")
 
-def multi_line_input():
+        if hasattr(my_list, "checkpoint"):
+            # Each command that changed the buffer is one step to undo
+            my_list.checkpoint()
+
+        if command_stats is not None:
+            command_stats.stop(command[0])
+            if quit and stats_file is not None:
+                command_stats.dump(stats_file)
+
+    if script is not None:
+        print_script_summary(script_counts, time.perf_counter() - script_start)
+
+def open_journal(list_it, file_name, interner=None):
+    """
+    Starts journaling the edits to file_name: reads the file into the
+    buffer (if it exists), replays any journal a previous session left
+    behind, and wraps list_it so that every edit from now on is journaled.
+
+    @param      list_it: iterator of an empty buffer
+    @param      file_name: the file to edit
+    @param      interner: if given, the LineInterner to read the file through
+    @return     a pair of the journaling iterator and its Journal
+    @complexity O(N + R*S), where N is the size of the file, R the number
+                of records in the journal and S the cost of seek()
+    """
+    journal = Journal(file_name)
+    if os.path.exists(file_name):
+        read_from_file(list_it, file_name, interner)
+    if journal.exists() and journal.is_stale():
+        # Its edits may be in the file already: replaying them again would
+        # corrupt it
+        print("Not replaying {0}, which was started on another version of "
+              "{1}; kept as {2}".format(journal.journal_name, file_name,
+                                        journal.set_aside()))
+    elif journal.exists():
+        try:
+            replayed = journal.replay(list_it)
+            print("Recovered {0} unsaved edits from {1}".format(
+                replayed, journal.journal_name))
+        except ValueError as e:
+            # Start again from the file, keeping the journal to look at
+            print("Not recovering edits: {0}; kept as {1}".format(
+                e, journal.set_aside()))
+            list_it.linked_list.reset()
+            list_it.reset()
+            if os.path.exists(file_name):
+                read_from_file(list_it, file_name, interner)
+    list_it.reset()
+    return JournalingIterator(list_it, journal), journal
+
+def multi_line_input(script=None):
     """
     Allows user to input several lines, ends input when it hits "."
 
@@ -115,10 +357,21 @@ def multi_line_input():
     @author     Jerry Lu
     @pre        None
     @post       User needs to enter ".", so that it can save the string.
+    @param      script: if given, the file to read the lines from instead
+                of the console; its end also ends the input.
     @return     buffer: a list of strings
     @complexity Best and worst: O(n), where n is the number of lines
                 entered by user.
     """
+    if script is not None:
+        buffer = []
+        for line in script:
+            line = line.rstrip("\n")
+            if line == ".":
+                break
+            buffer.append(line)
+        return buffer
+
     print("Enter a . by itself to save.")
     buffer = []
     while True:
@@ -129,40 +382,130 @@ def multi_line_input():
 
     return buffer
 
-def write_to_file(list_it, file_name):
+def print_script_summary(counts, seconds):
+    """
+    Prints how many commands a script ran, of each kind, and how fast.
+
+    @param      counts: dictionary from each command to how often it ran
+    @param      seconds: how long the script took
     """
-    Stores each line of an UnsortedLinkedList into a file.
+    total = sum(counts.values())
+    print("Ran {0} commands in {1:.3f} s ({2:.0f} commands/s): {3}".format(
+        total, seconds, total / max(seconds, 1e-9),
+        ", ".join("{0} {1}".format(command, count)
+                  for command, count in sorted(counts.items()))))
+
+def write_to_file(list_it, file_name, buffer_size=WRITE_BUFFER_SIZE,
+                  line_range=None, report=print):
+    """
+    Stores each line of an UnsortedLinkedList into a file, or only the
+    lines in line_range.
+
+    The lines are written in batches of buffer_size bytes to a temporary
+    file in the same directory, which is synced to disk and then renamed
+    over file_name. A crash halfway through leaves the old file as it was,
+    and a buffer that still maps the old file can keep reading it.
 
     @modified   Jerry Lu
     @since      1 September 2013
     @param      list_it: used to iterate over our linked list
     @param      file_name: is the name to be given the output file.
+    @param      buffer_size: bytes of output to collect before each write.
+    @param      line_range: if given, the pair of the first and last line
+                numbers to write, both included.
+    @param      report: function to pass the messages about the write to,
+                instead of printing them.
+    @return     True if the file was saved, False if not.
     @pre        file_name is a valid file name.
     @postevery  string in every node of the list is written into a new file
                 created with name file_name, in the same order as it appears
                 in the list. The list itself is not altered.
     @complexity Best: O(1), if the file can't be opened.
                 Worst: O(n), where n is the number of lines in the file.
+                With line_range (a, b): the complexity of seek() to line a,
+                plus O(b - a).
     """
-
-    # Create a filehandle to do the output.
+    if line_range is not None and not validate_range(list_it, *line_range):
+        report("Line range out of range.  File not saved.")
+        return False
+    start = time.perf_counter()
+    buffer = list_it.linked_list
+    directory = os.path.dirname(os.path.abspath(file_name))
+
+    # Create a filehandle to do the output, next to where the file goes.
     try:
-        f = open(file_name, "w")
-    except IOError:
+        fd, temp_name = tempfile.mkstemp(
+            prefix="." + os.path.basename(file_name) + ".", suffix=".tmp",
+            dir=directory)
+        f = os.fdopen(fd, "w", buffering=buffer_size)
+    except (IOError, OSError):
         # If opening the file didn't work...
-        print("Error opening file:" + file_name + ".  File not saved.")
-        return
+        report("Error opening file:" + file_name + ".  File not saved.")
+        return False
 
-    # loop through the list and output each line to the file.
-    list_it.reset()
+    try:
+        with f:
+            if line_range is not None:
+                first, last = line_range
+                list_it.seek(first - 1)
+                f.writelines(str(item) + "\n" for item in
+                             islice(list_it, last - first + 1))
+            elif hasattr(buffer, "write_to"):
+                # The buffer can stream itself out in chunks
+                buffer.write_to(f)
+            else:
+                # loop through the list and output each line to the file.
+                list_it.reset()
+                f.writelines(str(item) + "\n" for item in list_it)
+            f.flush()
+            os.fsync(f.fileno())
+            size = os.fstat(f.fileno()).st_size
+        os.chmod(temp_name, file_mode(file_name))
+        os.replace(temp_name, file_name)
+        fsync_directory(directory)
+    except (IOError, OSError, ValueError) as e:
+        report("Error writing file:" + file_name + ".  File not saved. " +
+               str(e))
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        return False
+
+    seconds = time.perf_counter() - start
+    report("Current buffer saved to file " + file_name +
+           " ({0} bytes in {1:.3f} s, {2:.1f} MB/s)".format(
+               size, seconds, size / max(seconds, 1e-9) / 1e6))
+    return True
+
+def file_mode(file_name):
+    """
+    The permissions a file written as file_name should get: those of the
+    file it replaces, or the ones open() would give a new file.
 
-    for item in list_it:
-        print(item, end='\n', file=f)
+    @complexity O(1)
+    """
+    try:
+        return stat.S_IMODE(os.stat(file_name).st_mode)
+    except OSError:
+        return 0o666 & ~UMASK
+
+def fsync_directory(directory):
+    """
+    Syncs a directory to disk, so that a rename in it survives a crash.
+    Does nothing where directories can't be opened, as on Windows.
 
-    f.close();
-    print("Current buffer saved to file " + file_name)
+    @complexity O(1)
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-def read_from_file(list_it, file_name):
+def read_from_file(list_it, file_name, interner=None):
     """
     Reads a text file line by line into an UnsortedLinkedList whose
     Iterator is passed in. If there is any data already in the list, the new
@@ -172,22 +515,32 @@ def read_from_file(list_it, file_name):
                used to iterate over our linked list ADT.
     @param file_name
                is the text file to be loaded into memory.
+    @param interner
+               if given, the LineInterner to pass the lines through, so that
+               identical lines share one string.
     @pre none
     @post the list contains everything it had before in the same order, plus
           every line in the text file also in the same order it appears in
           the file. The file is not altered.
     @complexity O(N*(M+S)) where N is the number of lines in the list and. M
                 is the complexity of reading a line from file. S is the
-                complexity of adding a line to the list
+                complexity of splicing a line into the list, O(1) for linked
+                lists. A piece table keeps the file as one buffer instead,
+                and adds it as one piece.
     """
 
     try:
-        # We use a context manager to open the file for reading
-        with open(file_name, "r") as f:
-            # The file is now open, let's read from it.
-            for line in f:
-                list_it.add_here(line.strip("\n"));
-        # we don't need to close the file, the context manager does it!
+        if hasattr(list_it, "add_file"):
+            list_it.add_file(file_name)
+        else:
+            # We use a context manager to open the file for reading
+            with open(file_name, "r") as f:
+                # The file is now open, let's splice its lines in.
+                lines = (line.strip("\n") for line in f)
+                if interner is not None:
+                    lines = interner.intern_all(lines)
+                list_it.splice(lines)
+            # we don't need to close the file, the context manager does it!
         print("File " + file_name + " successfully read in")
 
     # We manage wrong filenames in our program, raise everything else
@@ -198,20 +551,53 @@ def read_from_file(list_it, file_name):
         else:
             raise e
 
-def printall(list_it):
+def printall(list_it, page_lines=None, more=None):
     """Prints the entire buffer to the screen.
 
+    Lines go to the buffered standard output a chunk at a time, with one
+    write per chunk rather than one print() per line.
+
     @author     Jerry Lu
     @modified   Jeffrey Dowdle
     @since      1 September 2013
     @param      list_it: iterator to traverse buffer
-    @post       list_it will be at end of list.
+    @param      page_lines: if given, print this many lines at a time, and
+                call more() between pages
+    @param      more: function returning false to stop paging, or None to
+                print every page without asking
+    @post       list_it will be at end of list, or of the last page printed.
     @complexity Best/Worst: O(N), where N is the size of the list.
     """
+    buffer = list_it.linked_list
+    if page_lines is None and hasattr(buffer, "write_to"):
+        # The buffer can stream itself out in chunks
+        buffer.write_to(sys.stdout)
+        list_it.seek(len(buffer))
+        return
+
     list_it.reset()
 
-    for item in list_it:
-        print(item)
+    chunk_lines = page_lines or CHUNK_LINES
+    while list_it.has_next():
+        sys.stdout.write("\n".join(
+            str(item) for item in islice(list_it, chunk_lines)) + "\n")
+        if page_lines is not None and more is not None and \
+                list_it.has_next():
+            sys.stdout.flush()
+            if not more():
+                break
+
+def ask_more():
+    """
+    Asks at the console whether to print another page.
+
+    @return     false if the answer is q, or the input has ended
+    """
+    try:
+        answer = input("-- More (Enter for the next page, q to stop) --")
+    except EOFError:
+        return False
+    return answer.strip().lower() != "q"
 
 
 def print_n(list_it, n):
@@ -224,23 +610,30 @@ def print_n(list_it, n):
     @pre        n must be an integer greater than 0
     @post       List is unchanged
     @complexity Best: O(1), if first line is the one we want to print.
-                Worst: O(n), if the line we want to print is at the
-                around the end of the list.
+                Worst: the complexity of seek() on the buffer, O(n) for
+                linked lists and O(log n) for skip lists.
     """
     if not validate_line_number(list_it, n):
         raise Exception("Line number out of range.")
 
-    # Reset iterator
-    list_it.reset()
-    counter = 1
-
-    # call next() n times
-    while counter < n:
-        list_it.next()
-        counter += 1
+    # Line n is at index n - 1
+    list_it.seek(n - 1)
 
     print(list_it.next())
 
+def print_tail(list_it, n):
+    """
+    Prints the last n lines of the list, or all of them if it has fewer.
+
+    @param      n: how many lines to print
+    @post       list_it will be at end of list.
+    @complexity the complexity of seek() to line len - n, plus O(n): O(n)
+                in all for doubly linked lists, which seek from their tail
+    """
+    list_it.seek(max(0, get_length_of_list(list_it) - n))
+    for item in list_it:
+        print(item)
+
 def delete_n(list_it, n):
     """
     Deletes the Nth line in the list, where the first line is numbered 1.
@@ -252,23 +645,94 @@ def delete_n(list_it, n):
     @post       List length is reduced by 1 if delete is successful
     @raises     Exception: When line number is invalid.
     @complexity Best: O(1), if first line is the one we want to delete.
-                Worst: O(n), if the line we want to delete is at the
-                around the end of the list.
+                Worst: the complexity of seek() plus delete() on the
+                buffer, O(n) for linked lists and O(log n) for skip lists.
     """
     if not validate_line_number(list_it, n):
         raise Exception("Line number out of range.")
 
-    # Reset iterator
-    list_it.reset()
-    counter = 1
-
-    # call next() n times
-    while counter < n:
-        list_it.next()
-        counter += 1
+    # Line n is at index n - 1
+    list_it.seek(n - 1)
 
     print("Deleted line {0}: {1}".format(n, list_it.delete()))
 
+def parse_range(text):
+    """
+    Reads a line range written "a..b".
+
+    @return     the pair (a, b), or None if text is not a range
+    @raises     ValueError if a or b is not an integer
+    """
+    if ".." not in text:
+        return None
+    first, last = text.split("..", 1)
+    return int(first), int(last)
+
+def validate_range(list_it, first, last):
+    """
+    Checks that first..last is a valid, non-empty range of line numbers.
+
+    @complexity Best and worst: O(1)
+    """
+    return 1 <= first <= last <= get_length_of_list(list_it)
+
+def print_range(list_it, first, last):
+    """
+    Prints lines first to last, both included, seeking to the first one
+    once and walking on from there.
+
+    @raises     Exception: if the range is invalid
+    @complexity the complexity of seek() to line first, plus O(k) for the
+                k lines printed
+    """
+    if not validate_range(list_it, first, last):
+        raise Exception("Line range out of range.")
+    list_it.seek(first - 1)
+    for item in islice(list_it, last - first + 1):
+        print(item)
+
+def delete_range(list_it, first, last):
+    """
+    Deletes lines first to last, both included, seeking to the first one
+    once and deleting from there.
+
+    @raises     Exception: if the range is invalid
+    @complexity the complexity of seek() to line first, plus k times that
+                of delete(), for the k lines deleted: O(first + k) for
+                linked lists
+    """
+    if not validate_range(list_it, first, last):
+        raise Exception("Line range out of range.")
+    list_it.seek(first - 1)
+    for _ in range(last - first + 1):
+        list_it.delete()
+    print("Deleted lines {0} to {1}.".format(first, last))
+
+def print_memory(list_it, interner=None):
+    """
+    Prints how many of the buffer's lines are distinct, and how many bytes
+    identical lines save by sharing one string.
+
+    @param      list_it: iterator to traverse buffer
+    @param      interner: the editor's LineInterner, if it is interning
+    @post       list_it will be at end of list.
+    @complexity O(N), where N is the size of the list.
+    """
+    list_it.reset()
+    usage = memory_usage(list_it)
+    print("{0} lines, {1} distinct, in {2} strings.".format(
+        usage["lines"], usage["unique"], usage["strings"]))
+    print("{0} bytes of strings, {1} saved by sharing ({2} as a string "
+          "each).".format(usage["bytes"], usage["saved_bytes"],
+                          usage["unshared_bytes"]))
+    if interner is None:
+        print("Not interning; start with --intern.")
+    else:
+        print("Interned {0} of {1} lines read in, keeping {2} of at most "
+              "{3} distinct lines.".format(interner.shared, interner.seen,
+                                           len(interner.canonical),
+                                           interner.limit))
+
 def validate_line_number(list_it, n):
     """
     Checks if n is a valid line number
@@ -276,17 +740,15 @@ def validate_line_number(list_it, n):
     @author     Jeffrey Dowdle
     @since      4 September 2013
     @pre        n needs to be an integer
-    @complexity Best and worst: O(n), where n is the length of list_it
+    @complexity Best and worst: O(1), the list keeps track of its length
     """
-    list_it.reset()
-
     # Find the length of the list
     length = get_length_of_list(list_it)
 
     # Check whether n is a valid line number
     return n <= length and n >= 1
 
-def append(list_it, append_data):
+def append(list_it, append_data, interner=None):
     """
     Inserts some lines of text at the end of the list.
 
@@ -294,20 +756,19 @@ def append(list_it, append_data):
                 Jeffrey Dowdle
     @since      4 September 2013
     @pre        append_data is a list of strings.
+    @param      interner: if given, the LineInterner to pass the lines
+                through
     @post       list_it contains append_data at the end
-    @complexity Best and worst: O(n + m), where n is the number of lines
-                in append_data, m is the number of elements already in
-                list_it.
+    @complexity Best and worst: O(n), where n is the number of lines in
+                append_data: the length of a list is kept, and seeking to its
+                end jumps to its tail.
     """
-    # Reset iterators
-    list_it.reset()
-
     n = get_length_of_list(list_it)
 
     # Append is a special case of insert where n is length of list_it
-    insert(list_it, append_data, n)
+    insert(list_it, append_data, n, interner)
 
-def insert(list_it, insert_data, n):
+def insert(list_it, insert_data, n, interner=None):
     """
     Inserts text at the nth line in the list
 
@@ -315,24 +776,22 @@ def insert(list_it, insert_data, n):
     @author     Jerry Lu
     @modified   Jeffrey Dowdle
     @pre        insert_data needs to be a valid list
+    @param      interner: if given, the LineInterner to pass the lines
+                through
     @post       list_it gets all text from insert_data inserted
     @complexity Best case: O(m), m being the length of the insert_data
                 list, where list is inserted at the start
                 Worst case: O(n + m), where n is close to the end of
-                list it. m is defined in best case.
+                list it. m is defined in best case. With a skip list
+                seeking only costs O(log n).
     """
-    # Reset iterators
-    list_it.reset()
-
-    # n = int(n)
-
     # Get to the nth line in the list
-    for _ in range(n):
-        list_it.next()
+    list_it.seek(n)
 
     # Add elements
-    for lines in insert_data:
-        list_it.add_here(lines)
+    if interner is not None:
+        insert_data = interner.intern_all(insert_data)
+    list_it.splice(insert_data)
 
 def get_length_of_list(list_it):
     """
@@ -340,38 +799,265 @@ def get_length_of_list(list_it):
 
     @since      5 September 2013
     @author     Jeffrey Dowdle
+    @modified   the list now tracks its own length, so we just ask it
     @pre        list_it needs to be a valid list
-    @complexity Best and worst: O(n), where n is the size of the list.
+    @complexity Best and worst: O(1)
     """
-    list_it.reset()
-
-    # Find the length of the list
-    length = 0
-    for _ in list_it:
-        length += 1
-
-    return length
+    return len(list_it.linked_list)
 
 def filter_word(list_it, word):
     """
     Advanced question.
     Deletes the line in list_it if it contain the word.
 
+    The word may be any part of a line, not only a whole word. With a word
+    index, and a word made of word characters only, the lines are those of
+    the indexed words containing it, and only they are visited.
+
     @author     Jeffrey Dowdle
+    @modified   now a special case of filter_lines()
     @since      6 September 2013
     @pre        word: is a string
     @post       lines containing word is deleted.
-    @complexity O(n), where n is the length of the list
+    @return     the number of lines deleted
+    @complexity O(n), where n is the length of the list; with the index,
+                O(V*W + p) for V distinct words of length up to W, where
+                p is the position of the last line deleted
+    """
+    linked_list = list_it.linked_list
+    index = getattr(linked_list, "word_index", None)
+    if index is not None and WORD.fullmatch(word):
+        positions = [position for position, _ in
+                     linked_list.positions_of(index.containing(word))]
+        return delete_positions(list_it, positions)
+    return filter_lines(list_it, compile_filter([word]))
+
+def compile_filter(patterns, regex=False, ignore_case=False,
+                   whole_words=False):
+    """
+    Compiles the words (or regular expressions) to filter by into a single
+    regular expression that matches a line containing any of them, so that
+    each line is searched once however many words there are.
+
+    @param      patterns: list of words, or of regular expressions
+    @param      regex: whether patterns are regular expressions
+    @param      ignore_case: whether to match regardless of case
+    @param      whole_words: whether to only match whole words
+    @return     the compiled regular expression
+    @raises     ValueError if there are no patterns
+    @raises     re.error if a regular expression is not valid
+    @complexity O(m), where m is the total length of the patterns
+    """
+    if not patterns:
+        raise ValueError("Nothing to filter by.")
+    if not regex:
+        patterns = [re.escape(pattern) for pattern in patterns]
+    combined = "|".join("(?:" + pattern + ")" for pattern in patterns)
+    if whole_words:
+        combined = r"\b(?:" + combined + r")\b"
+    return re.compile(combined, re.IGNORECASE if ignore_case else 0)
+
+def filter_lines(list_it, matcher, invert=False):
+    """
+    Deletes every line that matcher finds a match in, or with invert every
+    line it doesn't, in one pass over the list.
+
+    @param      matcher: compiled regular expression, as from
+                compile_filter()
+    @param      invert: if true, keep only the matching lines
+    @post       list_it is at the end of the list
+    @return     the number of lines deleted
+    @complexity O(n*s), where n is the length of the list and s the cost of
+                searching a line
     """
+    search = matcher.search
+    deleted = 0
     list_it.reset()
 
     while list_it.has_next():
-        print(word)
-        line = list_it.peek()
-        print(line)
-        if word in line:
+        if (search(list_it.peek()) is None) == invert:
             list_it.delete()
-        list_it.next()
+            deleted += 1
+        else:
+            list_it.next()
+    return deleted
+
+def filter_command(list_it, args):
+    """
+    Runs a filter command, given the arguments after the word "filter":
+    any of the options -v (keep only the matching lines, deleting the
+    rest), -i (ignore case), -w (match whole words only), -r (the rest
+    of the command is a regular expression) and -j n (search on n worker
+    processes), followed by the words to filter by.
+
+    A plain -w filter on a buffer with a word index is answered from the
+    index, only visiting the list up to the last line to delete.
+
+    @raises     ValueError if there is nothing to filter by
+    @raises     re.error if the regular expression is not valid
+    @complexity O(n*s), as for filter_lines(), or O(p) with the index,
+                where p is the position of the last line deleted
+    """
+    options, workers, args = parse_options(args, ("-v", "-i", "-w", "-r"))
+    if "-r" in options:
+        # A regular expression may contain spaces
+        args = [" ".join(args)] if args else []
+    else:
+        args = [word for word in args if word]
+
+    total = len(list_it.linked_list)
+    index = getattr(list_it.linked_list, "word_index", None)
+    if options == {"-w"} and index is not None and \
+            all(WORD.fullmatch(word) for word in args):
+        deleted = delete_positions(list_it, indexed_positions(list_it, args))
+    else:
+        matcher = compile_filter(args, "-r" in options, "-i" in options,
+                                 "-w" in options)
+        if workers is None:
+            deleted = filter_lines(list_it, matcher, "-v" in options)
+        else:
+            list_it.reset()
+            positions = matching_positions(list(list_it), matcher, workers,
+                                           "-v" in options)
+            deleted = delete_positions(list_it, positions)
+    print("Filtered out {0} of {1} lines.".format(deleted, total))
+
+def parse_options(args, flags):
+    """
+    Takes the options off the front of a command's arguments: any of the
+    given flags, and -j n for the number of worker processes.
+
+    @param      args: the arguments after the command name
+    @param      flags: the flags the command accepts
+    @return     triple of the set of flags given, the number of workers
+                (None if -j wasn't given) and the remaining arguments
+    @raises     ValueError if -j isn't followed by a positive number
+    @complexity O(a), where a is the number of arguments
+    """
+    options = set()
+    workers = None
+    while args and (args[0] in flags or args[0] == "-j"):
+        if args[0] == "-j":
+            if len(args) < 2 or not args[1].isdigit() or int(args[1]) < 1:
+                raise ValueError("-j needs a number of workers.")
+            workers = int(args[1])
+            args = args[2:]
+        else:
+            options.add(args[0])
+            args = args[1:]
+    return options, workers, args
+
+def indexed_positions(list_it, words):
+    """
+    Finds the lines containing any of words using the buffer's word index.
+
+    @pre        the buffer has a word index
+    @return     sorted list of the positions (from 0) of those lines
+    @complexity O(p), where p is the position of the last line found
+    """
+    linked_list = list_it.linked_list
+    nodes = set()
+    for word in words:
+        nodes |= linked_list.word_index.lookup(word)
+    return [position for position, _ in linked_list.positions_of(nodes)]
+
+def delete_positions(list_it, positions):
+    """
+    Deletes the lines at the given positions, in one pass.
+
+    @param      positions: sorted list of positions (from 0)
+    @return     the number of lines deleted
+    @complexity O(p) for linked lists, where p is the last position
+    """
+    for deleted, position in enumerate(positions):
+        # Every line deleted moves the later ones up by one
+        list_it.seek(position - deleted)
+        list_it.delete()
+    return len(positions)
+
+def find_lines(list_it, word, workers=None):
+    """
+    Finds the lines that contain word as a whole word.
+
+    With a word index the lines are looked up in it, and the list is
+    walked only as far as the last of them; without one, every line is
+    split into words, or searched on workers processes if given.
+
+    @return     list of (line number, line) for each line found
+    @complexity O(p) with the index, where p is the position of the last
+                line found, or O(n*L) without, for n lines of length L
+    """
+    if not WORD.fullmatch(word):
+        # No line can contain it as a whole word
+        return []
+    index = getattr(list_it.linked_list, "word_index", None)
+    if index is not None:
+        return [(position + 1, line) for position, line in
+                list_it.linked_list.positions_of(index.lookup(word))]
+
+    found = []
+    list_it.reset()
+    if workers is not None:
+        lines = list(list_it)
+        matcher = compile_filter([word], whole_words=True)
+        return [(position + 1, lines[position]) for position in
+                matching_positions(lines, matcher, workers)]
+    for number, line in enumerate(list_it, 1):
+        if word in words_of(line):
+            found.append((number, line))
+    return found
+
+def find_word(list_it, word, workers=None):
+    """
+    Prints every line that contains word as a whole word, with its number.
+
+    @complexity as for find_lines()
+    """
+    found = find_lines(list_it, word, workers)
+    for number, line in found:
+        print("{0}: {1}".format(number, line))
+    print("Found {0} lines containing {1!r}.".format(len(found), word))
+
+def rfind_lines(list_it, word, count=1):
+    """
+    Finds the last count lines that contain word as a whole word, starting
+    from the end of the list.
+
+    An iterator that can move backwards (with prev()) walks back from the
+    end only until it has found them; any other walks the whole list
+    forwards, keeping the last count lines found.
+
+    @return     list of (line number, line) for each line found, last first
+    @complexity O(d*L) backwards, where d is the distance from the end to
+                the count-th line found from it, else as for find_lines()
+    """
+    if not WORD.fullmatch(word):
+        return []
+    if not hasattr(list_it, "prev"):
+        found = deque(find_lines(list_it, word), maxlen=count)
+        found.reverse()
+        return list(found)
+
+    found = []
+    number = get_length_of_list(list_it)
+    list_it.seek(number)
+    while len(found) < count and list_it.has_prev():
+        line = list_it.prev()
+        if word in words_of(line):
+            found.append((number, line))
+        number -= 1
+    return found
+
+def rfind_word(list_it, word, count=1):
+    """
+    Prints the last count lines that contain word, last first.
+
+    @complexity as for rfind_lines()
+    """
+    found = rfind_lines(list_it, word, count)
+    for number, line in found:
+        print("{0}: {1}".format(number, line))
+    print("Found {0} lines containing {1!r}.".format(len(found), word))
 
 # Let's write tests too
 def run_tests():
@@ -389,6 +1075,8 @@ def run_tests():
         test_insert()
         test_append()
         test_delete()
+        test_ranges()
+        test_filter()
     except Exception as e:
         raise e
 
@@ -528,6 +1216,69 @@ def test_delete():
     printall(test_iter)
 
 
+def test_ranges():
+    """
+    Tests print_range() and delete_range(), on ranges of one line and of
+    several, ending at the last line.
+
+    @complexity O(1) as it runs with static data.
+    """
+    test_data = ["This","is","test","data"]
+    test_list = createTestList(test_data)
+    test_iter = iter(test_list)
+
+    print()
+    print("TESTING ranges")
+    print()
+    print("Expected:")
+    print("is")
+    print("test")
+    print("data")
+    print()
+    print("Got:")
+    print_range(test_iter, 2, 4)
+    delete_range(test_iter, 3, 4)
+    delete_range(test_iter, 1, 1)
+    print("Expected:")
+    print("is")
+    print("Got:")
+    printall(test_iter)
+
+
+def test_filter():
+    """
+    Tests filter_command() with several words, ignoring case, and keeping
+    only the matching lines.
+
+    @complexity O(1) as it runs with static data.
+    """
+    test_data = ["This", "is", "test", "data", "THIS", "is", "more"]
+    test_iter = iter(createTestList(list(test_data)))
+
+    print()
+    print("TESTING filter")
+    print()
+    print("Expected:")
+    print("Filtered out 4 of 7 lines.")
+    print("test")
+    print("data")
+    print("more")
+    print()
+    print("Got:")
+    filter_command(test_iter, ["-i", "this", "is"])
+    printall(test_iter)
+
+    test_iter = iter(createTestList(list(test_data)))
+    print()
+    print("Expected:")
+    print("Filtered out 5 of 7 lines.")
+    print("data")
+    print("more")
+    print()
+    print("Got:")
+    filter_command(test_iter, ["-v", "-r", "^(da|mo)"])
+    printall(test_iter)
+
 
 def test_read_from_file():
     """
@@ -594,4 +1345,33 @@ def test_write_to_file():
     return
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="A simple text editor.")
+    parser.add_argument("--buffer", choices=sorted(BUFFER_TYPES),
+                        default="linked",
+                        help="list implementation to keep the text in")
+    parser.add_argument("--lazy", action="store_true",
+                        help="map files into memory and only decode lines "
+                             "when needed (implies --buffer piecetable)")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="edit FILE, journaling every change next to it "
+                             "and recovering any unsaved changes found there")
+    parser.add_argument("--index", action="store_true",
+                        help="keep an index of the words in the buffer, "
+                             "for find and filter -w")
+    parser.add_argument("--stats", action="store_true",
+                        help="time every command and count the nodes it "
+                             "traverses and allocates (see the stats command)")
+    parser.add_argument("--stats-json", metavar="FILE",
+                        help="write the statistics to FILE as JSON on quit "
+                             "(implies --stats)")
+    parser.add_argument("--script", metavar="FILE",
+                        type=argparse.FileType("r"),
+                        help="run the commands in FILE ('-' for standard "
+                             "input) without the menu, then quit")
+    parser.add_argument("--intern", action="store_true",
+                        help="share one string between identical lines "
+                             "read, inserted or appended (see the memory "
+                             "command)")
+    args = parser.parse_args()
+    main(args.buffer, args.lazy, args.journal, args.index, args.stats,
+         args.stats_json, args.script, args.intern)
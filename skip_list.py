@@ -0,0 +1,437 @@
+#!/usr/bin/python3
+
+"""
+This file implements the list data type as an indexable skip list, so that
+the editor can get to any line number in O(log N) expected time.
+
+The bottom level of the skip list is an ordinary singly linked list, which
+is what the iterator walks for next() and peek(). The levels above it are
+"express lanes" where every link also records its width, i.e. how many
+positions it skips over. Adding up widths on the way down lets us find the
+node at any index without visiting the nodes in between.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past the end
+@knownBugs      none
+"""
+
+import random
+
+# Enough levels for far more lines than fit in memory at p = 1/2
+MAX_LEVELS = 32
+
+
+class SkipNode:
+    """
+    Nodes where items are stored in the skip list.
+
+    links[i] is the next node at level i (None at the end of the list),
+    and widths[i] is the number of positions that link moves forward.
+    """
+
+    __slots__ = ("item", "links", "widths")
+
+    def __init__(self, new_item, levels):
+        """
+        Creates a new node on the given number of levels, not yet linked.
+
+        @param new_item to store in this node
+        @param levels how many levels of links the node takes part in
+        @complexity  best and worst case: O(levels)
+        """
+        self.item = new_item
+        self.links = [None] * levels
+        self.widths = [0] * levels
+
+    @property
+    def link(self):
+        """The successor node at the bottom level, as in Node."""
+        return self.links[0]
+
+
+class SkipList:
+    """
+    An indexable skip list implementation.
+
+    Invariants for the class:
+        (1) head is a sentinel node at position 0 on every level; items are
+            at positions 1 to length
+        (2) for every level below levels, following links from head visits
+            nodes in list order, and the widths along the way add up to
+            the distance between their positions
+        (3) a link to None has the width it would have to a node just past
+            the end of the list
+    """
+
+    def __init__(self, size=None):
+        """
+        Creates an empty skip list.
+
+        Parameter `size` is included to provide compatibility with the
+        interface of the ArrayList, and then disregarded.
+
+        @post           an empty list object is created
+        @complexity     best and worst case: O(MAX_LEVELS)
+        """
+        self.reset()
+
+    def is_empty(self):
+        """
+        Determines if the list has any elements.
+
+        @return         false if list has elements, true if empty
+        @complexity     best and worst case: O(1)
+        """
+        return self.length == 0
+
+    def __len__(self):
+        """
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return self.length
+
+    def __bool__(self):
+        """
+        @return         true if list has elements, false if empty
+        @complexity     best and worst case: O(1)
+        """
+        return not self.is_empty()
+
+    def is_full(self):
+        """
+        Determines whether the list is full, which it never is.
+
+        @return     false
+        @complexity best and worst case: O(1)
+        """
+        return False
+
+    def reset(self):
+        """
+        Resets the list to an empty state.
+
+        @post           the list is empty
+        @complexity     best and worst case: O(MAX_LEVELS)
+        """
+        self.head = SkipNode(None, MAX_LEVELS)
+        self.levels = 1
+        self.head.widths[0] = 1
+        self.length = 0
+
+    def _find_predecessors(self, position):
+        """
+        Finds, on each level in use, the last node at or before position.
+
+        @param      position of the node we want to stop at, counting the
+                    head sentinel as position 0
+        @return     a pair of lists (chain, steps), where chain[i] is the
+                    node found on level i and steps[i] its position
+        @complexity expected O(log N)
+        """
+        chain = [None] * self.levels
+        steps = [0] * self.levels
+        node = self.head
+        pos = 0
+        for level in reversed(range(self.levels)):
+            while node.links[level] is not None and \
+                    pos + node.widths[level] <= position:
+                pos += node.widths[level]
+                node = node.links[level]
+            chain[level] = node
+            steps[level] = pos
+        return chain, steps
+
+    def _random_levels(self):
+        """
+        Picks how many levels a new node takes part in: one level, plus
+        one more with probability 1/2 each time.
+
+        @complexity expected O(1)
+        """
+        levels = 1
+        while levels < MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, index, new_item):
+        """
+        Adds new_item so that it ends up at the given index.
+
+        @param      index where new_item will be, from 0 to len(list)
+        @param      new_item to add to this list
+        @return     the new node
+        @raises     IndexError if index is out of range
+        @post       list has one more element, list[index] is new_item
+        @complexity expected O(log N)
+        """
+        if index < 0 or index > self.length:
+            raise IndexError("list index out of range")
+
+        node_levels = self._random_levels()
+        while self.levels < node_levels:
+            # A link from head to None spans the whole list
+            self.head.links[self.levels] = None
+            self.head.widths[self.levels] = self.length + 1
+            self.levels += 1
+
+        chain, steps = self._find_predecessors(index)
+        new_node = SkipNode(new_item, node_levels)
+        for level in range(node_levels):
+            previous = chain[level]
+            distance = index - steps[level]
+            new_node.links[level] = previous.links[level]
+            new_node.widths[level] = previous.widths[level] - distance
+            previous.links[level] = new_node
+            previous.widths[level] = distance + 1
+        for level in range(node_levels, self.levels):
+            chain[level].widths[level] += 1
+
+        self.length += 1
+        return new_node
+
+    def pop(self, index):
+        """
+        Deletes the item at the given index and returns it.
+
+        @param      index of the item to delete
+        @return     the deleted item
+        @raises     IndexError if index is out of range
+        @post       list has one fewer element
+        @complexity expected O(log N)
+        """
+        if index < 0 or index >= self.length:
+            raise IndexError("list index out of range")
+
+        chain, _ = self._find_predecessors(index)
+        node = chain[0].links[0]
+        for level in range(self.levels):
+            previous = chain[level]
+            if previous.links[level] is node:
+                previous.links[level] = node.links[level]
+                previous.widths[level] += node.widths[level] - 1
+            else:
+                previous.widths[level] -= 1
+
+        self.length -= 1
+        return node.item
+
+    def node_before(self, index):
+        """
+        Finds the node just before the given index.
+
+        @param      index from 0 to len(list)
+        @return     the node at index - 1, or the head sentinel if index is 0
+        @complexity expected O(log N)
+        """
+        chain, _ = self._find_predecessors(index)
+        return chain[0]
+
+    def add_first(self, new_item):
+        """
+        Adds new_item as the first element of the list.
+
+        @param          new_item to add to this list
+        @post           list[0] equals new_item after the method is called
+        @complexity     expected O(log N)
+        """
+        self.insert(0, new_item)
+
+    def add(self, new_item):
+        """
+        As for unsorted linked lists, "add()" is synonymous with "add_first()"
+        """
+        self.add_first(new_item)
+
+    class ListIterator:
+        """
+        Implements the same iterator interface as
+        UnsortedLinkedList.ListIterator, with an O(log N) seek().
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the list, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.reset()
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        def __next__(self):
+            """
+            Returns the item of the current node and moves to the next one.
+
+            @return     the item of the current node of the iterator
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            if self.current is None:
+                raise StopIteration("no more elements in list")
+            item = self.current.item
+            self.previous = self.current
+            self.current = self.current.links[0]
+            self.position += 1
+            return item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def delete(self):
+            """
+            Returns the item of the current node, deletes it, moves to next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity expected O(log N)
+            """
+            if not self.has_next():
+                raise StopIteration("no more elements in list")
+            item = self.current.item
+            self.current = self.current.links[0]
+            self.linked_list.pop(self.position)
+            return item
+
+        def peek(self):
+            """
+            Returns the item of the current node without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            if self.current is None:
+                raise StopIteration("no more elements in list")
+            return self.current.item
+
+        def has_next(self):
+            """
+            @return     true if there is an element not yet iterated over
+            @complexity best and worst case: O(1)
+            """
+            return self.current is not None
+
+        def reset(self):
+            """
+            Resets the iterator to point to the head of the list.
+
+            @complexity best and worst case: O(1)
+            """
+            self.previous = None
+            self.current = self.linked_list.head.links[0]
+            self.position = 0
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the node at index is the current one.
+
+            @param      index of the node to move to, from 0 to len(list)
+            @raises     IndexError if index is out of range
+            @complexity expected O(log N)
+            """
+            if index < 0 or index > len(self.linked_list):
+                raise IndexError("list index out of range")
+            node = self.linked_list.node_before(index)
+            self.previous = None if node is self.linked_list.head else node
+            self.current = node.links[0]
+            self.position = index
+
+        def add_here(self, new_item):
+            """
+            Adds an item to the list, between previous and current.
+
+            @param      new_item: item to be added
+            @post       previous points to the new item, current is unchanged
+            @complexity expected O(log N)
+            """
+            self.previous = self.linked_list.insert(self.position, new_item)
+            self.position += 1
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable between previous and current, in
+            order, one add_here() at a time.
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @complexity expected O(M log N), for M items
+            """
+            count = 0
+            for count, item in enumerate(items, 1):
+                self.add_here(item)
+            return count
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def __repr__(self):
+        """
+        @return     Unambiguous string representation of the list
+        @complexity Best and worst case: O(N)
+        """
+        return " ".join(repr(item) for item in self)
+
+    __str__ = __repr__
+
+
+## REGRESSION TESTING CODE
+
+def test_insert_pop():
+    """Boundary analysis gives three cases for each: first position, last
+    position and somewhere in the middle, plus an out of range index.
+    """
+    print("TESTING insert() and pop()")
+    my_list = SkipList()
+    for i in range(10):
+        my_list.insert(i, i)
+    my_list.insert(0, 'first')
+    my_list.insert(11, 'last')
+    my_list.insert(5, 'middle')
+    print("Expected 'first' 0 1 2 3 'middle' 4 5 6 7 8 9 'last', got ",
+          my_list)
+    print("Expected 'middle', got ", repr(my_list.pop(5)))
+    print("Expected 'last', got ", repr(my_list.pop(11)))
+    print("Expected 'first', got ", repr(my_list.pop(0)))
+    print("Expected 0 1 2 3 4 5 6 7 8 9, got ", my_list)
+    print("Expected length 10, got ", len(my_list))
+    try:
+        my_list.pop(10)
+        print("Expected an exception, but something went wrong")
+    except IndexError as error:
+        print("Expected: <class 'IndexError'> : list index out of range")
+        print("Got     : ", type(error), ": ", error)
+
+def test_iterator():
+    """Checks the iterator against a Python list after a long run of
+    random inserts, deletes and seeks.
+    """
+    print("TESTING ListIterator")
+    my_list = SkipList()
+    reference = []
+    it = iter(my_list)
+    for step in range(2000):
+        index = random.randint(0, len(reference))
+        it.seek(index)
+        if reference and index < len(reference) and step % 3 == 0:
+            it.delete()
+            del reference[index]
+        else:
+            it.add_here(step)
+            reference.insert(index, step)
+    it.reset()
+    print("Expected True, got ", list(it) == reference)
+    index = len(reference) // 2
+    it.seek(index)
+    print("Expected True, got ", it.peek() == reference[index])
+
+
+if __name__ == "__main__":
+    test_insert_pop()
+    test_iterator()
@@ -0,0 +1,283 @@
+#!/usr/bin/python3
+
+"""
+Per-command latency statistics for the prac6 editor.
+
+CommandStats keeps, for every command, a rolling window of how long its
+last runs took, how many nodes the buffer's iterator stepped over and
+how many nodes were allocated, and reports them as percentiles.
+
+The node counts come from counting versions of the iterators' __next__()
+and walked() hooks and of the node classes' constructors, which
+enable_counters() puts in place of the originals. walked() is called by
+seek() with the nodes (or blocks, or pieces) it stepped over, and by a
+list's chunks() with the nodes it walked to write the list out. Until
+enable_counters() is called, nothing is counted and the hooks do nothing.
+
+@since          18 October 2026
+@input          none
+@output         the statistics table, and optionally a JSON file
+@errorHandling  none
+@knownBugs      the descents of skip lists and persistent lists to a
+                position are not counted as traversed
+"""
+
+import json
+import math
+import time
+from collections import deque
+
+from node import Node
+from skip_list import SkipNode, SkipList
+from piece_table import Piece, PieceTableBuffer
+from unrolled_linked_list import Block, UnrolledLinkedList
+from persistent_list import TreeNode, PersistentList
+from unsorted_linked_list import UnsortedLinkedList
+from doubly_linked_list import DoublyLinkedList
+from pooled_list import PooledList
+from compressed_list import CompressedBlock, CompressedList
+
+# The iterator classes whose __next__() is counted
+ITERATOR_TYPES = [UnsortedLinkedList.ListIterator,
+                  DoublyLinkedList.ListIterator, SkipList.ListIterator,
+                  PieceTableBuffer.ListIterator,
+                  UnrolledLinkedList.ListIterator,
+                  PersistentList.ListIterator, PooledList.ListIterator,
+                  CompressedList.ListIterator]
+
+# The classes, besides the iterators, whose walked() hook is counted
+WALKER_TYPES = [UnsortedLinkedList]
+
+# The classes whose instances are counted as nodes allocated (DoubleNode
+# is counted by the Node constructor it calls; pooled lists allocate slots,
+# not objects, and are not counted)
+NODE_TYPES = [Node, SkipNode, Piece, Block, TreeNode, CompressedBlock]
+
+# How many runs of each command the percentiles are taken over
+DEFAULT_WINDOW = 1000
+
+
+class Counters:
+    """
+    Running totals of nodes traversed and allocated, while enabled.
+    """
+    traversed = 0
+    allocated = 0
+
+
+# The methods enable_counters() replaced, to put back on disable
+_originals = []
+
+
+def _counting_next(original):
+    def __next__(self):
+        item = original(self)
+        Counters.traversed += 1
+        return item
+    return __next__
+
+
+def _counting_walked(original):
+    def walked(self, steps):
+        Counters.traversed += steps
+        original(self, steps)
+    return walked
+
+
+def _counting_init(original):
+    def __init__(self, *args, **kwargs):
+        Counters.allocated += 1
+        original(self, *args, **kwargs)
+    return __init__
+
+
+def enable_counters():
+    """
+    Starts counting nodes traversed and allocated, by replacing the
+    iterators' __next__() and the nodes' __init__() with counting versions.
+    Does nothing if already counting.
+
+    @complexity O(1)
+    """
+    if _originals:
+        return
+    for cls in ITERATOR_TYPES:
+        _originals.append((cls, "__next__", cls.__next__))
+        cls.__next__ = _counting_next(cls.__next__)
+    for cls in ITERATOR_TYPES + WALKER_TYPES:
+        # Only where it is defined, not inherited, to count steps once
+        if "walked" in cls.__dict__:
+            _originals.append((cls, "walked", cls.walked))
+            cls.walked = _counting_walked(cls.walked)
+    for cls in NODE_TYPES:
+        _originals.append((cls, "__init__", cls.__init__))
+        cls.__init__ = _counting_init(cls.__init__)
+
+
+def disable_counters():
+    """
+    Stops counting, putting back the original methods.
+
+    @complexity O(1)
+    """
+    while _originals:
+        cls, name, method = _originals.pop()
+        setattr(cls, name, method)
+
+
+def percentile(ordered, fraction):
+    """
+    @param      ordered: non-empty sorted list of numbers
+    @return     the value below which fraction of them lie (nearest rank)
+    """
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class CommandStats:
+    """
+    Rolling statistics of each command's runs.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        @param      window: how many of the latest runs of each command to
+                    keep for percentiles
+        @complexity O(1)
+        """
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.started = None
+
+    def start(self):
+        """
+        Marks the start of a command.
+        """
+        self.started = (time.perf_counter(), Counters.traversed,
+                        Counters.allocated)
+
+    def stop(self, command):
+        """
+        Marks the end of the command started last, and records it.
+
+        @complexity O(1)
+        """
+        seconds = time.perf_counter() - self.started[0]
+        sample = (seconds, Counters.traversed - self.started[1],
+                  Counters.allocated - self.started[2])
+        if command not in self.samples:
+            self.samples[command] = deque(maxlen=self.window)
+            self.counts[command] = 0
+        self.samples[command].append(sample)
+        self.counts[command] += 1
+
+    def summary(self):
+        """
+        @return     dictionary from each command to its run count, its
+                    p50, p95 and p99 latency in milliseconds, and the mean
+                    nodes traversed and allocated per run, over the window
+        @complexity O(C*W*log W), for C commands and window W
+        """
+        summary = {}
+        for command, samples in sorted(self.samples.items()):
+            latencies = sorted(sample[0] * 1000 for sample in samples)
+            summary[command] = {
+                "count": self.counts[command],
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "mean_traversed": sum(s[1] for s in samples) / len(samples),
+                "mean_allocated": sum(s[2] for s in samples) / len(samples),
+            }
+        return summary
+
+    def report(self):
+        """
+        Prints the summary as a table.
+        """
+        print("{0:<10} {1:>6} {2:>10} {3:>10} {4:>10} {5:>11} {6:>11}".format(
+            "command", "runs", "p50 ms", "p95 ms", "p99 ms", "traversed",
+            "allocated"))
+        for command, row in self.summary().items():
+            print("{0:<10} {1:>6} {2:>10.3f} {3:>10.3f} {4:>10.3f} "
+                  "{5:>11.1f} {6:>11.1f}".format(
+                      command, row["count"], row["p50_ms"], row["p95_ms"],
+                      row["p99_ms"], row["mean_traversed"],
+                      row["mean_allocated"]))
+
+    def dump(self, file_name):
+        """
+        Writes the summary to file_name as JSON.
+        """
+        with open(file_name, "w") as out:
+            json.dump(self.summary(), out, indent=2)
+
+
+## REGRESSION TESTING CODE
+
+def test_counters():
+    """Checks nodes are counted while enabled, and not after disabling."""
+    print("TESTING enable_counters()")
+    enable_counters()
+    stats = CommandStats()
+    stats.start()
+    my_list = UnsortedLinkedList()
+    for i in range(10):
+        my_list.add_first(i)
+    for _ in my_list:
+        pass
+    stats.stop("test")
+    disable_counters()
+    row = stats.summary()["test"]
+    print("Expected 10 traversed and 10 allocated, got ",
+          row["mean_traversed"], "traversed and", row["mean_allocated"],
+          "allocated")
+    before = Counters.traversed
+    for _ in my_list:
+        pass
+    print("Expected 0, got ", Counters.traversed - before)
+
+def test_walked():
+    """Printing line N seeks over about N nodes (or from the tail, for a
+    doubly linked list), writing the list out walks every node, and both
+    are counted.
+    """
+    import io
+    from prac6 import print_n
+    print("TESTING the counting of seek() and write_to()")
+    stats = CommandStats()
+    for cls, expected in ((UnsortedLinkedList, 4000), (PooledList, 4000),
+                          (DoublyLinkedList, 1001)):
+        my_list = cls()
+        for i in range(5000):
+            my_list.add_first(i)
+        list_it = iter(my_list)
+        enable_counters()
+        stats.start()
+        print_n(list_it, 4000)
+        stats.stop(cls.__name__)
+        disable_counters()
+        print("Expected", expected, "traversed, got ",
+              stats.summary()[cls.__name__]["mean_traversed"])
+    my_list = UnsortedLinkedList.from_iterable(range(5000))
+    enable_counters()
+    stats.start()
+    my_list.write_to(io.StringIO())
+    stats.stop("write_to")
+    disable_counters()
+    print("Expected 5000 traversed, got ",
+          stats.summary()["write_to"]["mean_traversed"])
+
+def test_percentile():
+    """Boundary cases: one value, and the top and bottom of a range."""
+    print("TESTING percentile()")
+    print("Expected 7, got ", percentile([7], 0.99))
+    print("Expected 50, got ", percentile(list(range(1, 101)), 0.50))
+    print("Expected 99, got ", percentile(list(range(1, 101)), 0.99))
+
+
+if __name__ == "__main__":
+    test_counters()
+    test_walked()
+    test_percentile()
@@ -0,0 +1,459 @@
+#!/usr/bin/python3
+
+"""
+This file implements the list data type as an unrolled linked list: a
+linked list whose nodes each hold a block of up to block_capacity items,
+stored in a Python list.
+
+A line of text then costs one slot in a block instead of a whole Node
+object, and walking the list follows one link per block instead of one
+per item. Blocks are split when an insertion overflows them and merged
+with their successor when deletions leave them less than half full.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  IndexError for out of range positions, StopIteration when
+                iterating past the end
+@knownBugs      none
+"""
+
+DEFAULT_BLOCK_CAPACITY = 64
+
+
+class Block:
+    """
+    Nodes of an unrolled linked list, each holding a list of items.
+    """
+
+    __slots__ = ("items", "link")
+
+    def __init__(self, items, successor_block=None):
+        """
+        @param items list of items to store in this block
+        @param successor_block refers to the successor block in the list
+        @complexity  best and worst case: O(1)
+        """
+        self.items = items
+        self.link = successor_block
+
+
+class UnrolledLinkedList:
+    """
+    An unrolled linked list implementation.
+
+    Invariants for the class:
+        (1) head points to the first block in the list, or None if empty
+        (2) each block points to the next block in the list
+        (3) no block is empty, and none holds more than block_capacity items
+        (4) length is the number of items in all the blocks
+    """
+
+    def __init__(self, size=None, block_capacity=DEFAULT_BLOCK_CAPACITY):
+        """
+        Creates an empty unrolled linked list.
+
+        Parameter `size` is included to provide compatibility with the
+        interface of the ArrayList, and then disregarded.
+
+        @param          block_capacity: most items a block can hold
+        @post           an empty list object is created
+        @complexity     best and worst case: O(1)
+        """
+        self.block_capacity = block_capacity
+        self.reset()
+
+    def is_empty(self):
+        """
+        @return         false if list has elements, true if empty
+        @complexity     best and worst case: O(1)
+        """
+        return self.head is None
+
+    def __len__(self):
+        """
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return self.length
+
+    def __bool__(self):
+        """
+        @return         true if list has elements, false if empty
+        @complexity     best and worst case: O(1)
+        """
+        return not self.is_empty()
+
+    def is_full(self):
+        """
+        Determines whether the list is full, which it never is.
+
+        @return     false
+        @complexity best and worst case: O(1)
+        """
+        return False
+
+    def reset(self):
+        """
+        Resets the list to an empty state.
+
+        @post           the list is empty
+        @complexity     best and worst case: O(1)
+        """
+        self.head = None
+        self.length = 0
+
+    def add_first(self, new_item):
+        """
+        Adds new_item as the first element of the list.
+
+        @param          new_item to add to this list
+        @post           list[0] equals new_item after the method is called
+        @complexity     O(B), where B is the block capacity
+        """
+        self.ListIterator(self).add_here(new_item)
+
+    def add(self, new_item):
+        """
+        As for unsorted linked lists, "add()" is synonymous with "add_first()"
+        """
+        self.add_first(new_item)
+
+    class ListIterator:
+        """
+        Implements the same iterator interface as
+        UnsortedLinkedList.ListIterator over an unrolled linked list.
+
+        The cursor is a block and an offset into its items, with block None
+        once we are past the end. previous_block is the block before it,
+        which we need in order to unlink blocks that become empty.
+        """
+
+        def __init__(self, linked_list):
+            """
+            Creates a new iterator for the list, pointing at its first item.
+
+            @complexity best and worst case: O(1)
+            """
+            self.linked_list = linked_list
+            self.reset()
+
+        def __iter__(self):
+            """required so Python recognises it as an iterator"""
+            return self
+
+        def __next__(self):
+            """
+            Returns the current item and moves to the next one.
+
+            @return     the item at the cursor
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            block = self.block
+            if block is None:
+                raise StopIteration("no more elements in list")
+            item = block.items[self.offset]
+            self.offset += 1
+            if self.offset == len(block.items):
+                self.previous_block = block
+                self.block = block.link
+                self.offset = 0
+            self.position += 1
+            return item
+
+        def next(self):
+            """Python2-style alias for __next__()"""
+            return self.__next__()
+
+        def peek(self):
+            """
+            Returns the current item without moving on.
+
+            @throws     StopIteration if there are no items left
+            @complexity best and worst case: O(1)
+            """
+            if self.block is None:
+                raise StopIteration("no more elements in list")
+            return self.block.items[self.offset]
+
+        def has_next(self):
+            """
+            @return     true if there is an element not yet iterated over
+            @complexity best and worst case: O(1)
+            """
+            return self.block is not None
+
+        def reset(self):
+            """
+            Resets the iterator to point to the head of the list.
+
+            @complexity best and worst case: O(1)
+            """
+            self.previous_block = None
+            self.block = self.linked_list.head
+            self.offset = 0
+            self.position = 0
+
+        def walked(self, steps):
+            """
+            Called by seek() with the number of blocks it stepped over.
+            Does nothing: stats.enable_counters() replaces it to count them.
+            """
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the item at index is the current one.
+
+            Seeking forwards skips whole blocks from where we are; seeking
+            backwards starts again from the head.
+
+            @param      index of the item to move to, from 0 to len(list)
+            @raises     IndexError if index is out of range
+            @complexity O(N/B), where B is the block capacity
+            """
+            if index < 0 or index > self.linked_list.length:
+                raise IndexError("list index out of range")
+            if index < self.position:
+                self.reset()
+            # Index of the first item of the current block
+            first = self.position - self.offset
+            steps = 0
+            while self.block is not None and \
+                    first + len(self.block.items) <= index:
+                first += len(self.block.items)
+                self.previous_block = self.block
+                self.block = self.block.link
+                steps += 1
+            self.walked(steps)
+            self.offset = index - first
+            self.position = index
+
+        def add_here(self, new_item):
+            """
+            Adds an item to the list, before the current one.
+
+            If the cursor is at the start of a block and the block before it
+            has room, the item goes at the end of that one, so adding lines
+            one after the other fills blocks up.
+
+            @param      new_item: item to be added
+            @post       new_item is in the list just before the current item
+            @complexity O(B), where B is the block capacity
+            """
+            linked_list = self.linked_list
+            capacity = linked_list.block_capacity
+            block = self.block
+            previous = self.previous_block
+
+            if self.offset == 0 and previous is not None and \
+                    len(previous.items) < capacity:
+                previous.items.append(new_item)
+            elif block is None:
+                # Past the end, and the last block (if any) is full
+                new_block = Block([new_item])
+                if previous is None:
+                    linked_list.head = new_block
+                else:
+                    previous.link = new_block
+                self.previous_block = new_block
+            else:
+                block.items.insert(self.offset, new_item)
+                self.offset += 1
+                if len(block.items) > capacity:
+                    half = len(block.items) // 2
+                    block.link = Block(block.items[half:], block.link)
+                    del block.items[half:]
+                    if self.offset >= half:
+                        self.previous_block = block
+                        self.block = block.link
+                        self.offset -= half
+            linked_list.length += 1
+            self.position += 1
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable before the current one, in order.
+
+            A run shorter than a block goes in through add_here(), which
+            fills the blocks around the cursor. A longer one splits the
+            current block at the cursor, if it is inside one, tops up the
+            block before the cursor and links in the rest as a chain of full
+            blocks, so each item costs a slot in a list instead of a call to
+            add_here().
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @post       the items are in the list just before the current item
+            @complexity O(M + B), for M items and block capacity B
+            """
+            items = list(items)
+            linked_list = self.linked_list
+            capacity = linked_list.block_capacity
+            if len(items) < capacity:
+                for item in items:
+                    self.add_here(item)
+                return len(items)
+            block = self.block
+
+            if block is not None and self.offset > 0:
+                block.link = Block(block.items[self.offset:], block.link)
+                del block.items[self.offset:]
+                self.previous_block = block
+                self.block = block = block.link
+                self.offset = 0
+
+            linked_list.length += len(items)
+            self.position += len(items)
+            start = 0
+            if self.previous_block is not None:
+                start = capacity - len(self.previous_block.items)
+                self.previous_block.items.extend(items[:start])
+                if start >= len(items):
+                    return len(items)
+
+            first = last = None
+            for start in range(start, len(items), capacity):
+                new_block = Block(items[start:start + capacity])
+                if first is None:
+                    first = new_block
+                else:
+                    last.link = new_block
+                last = new_block
+            last.link = block
+            if self.previous_block is None:
+                linked_list.head = first
+            else:
+                self.previous_block.link = first
+            self.previous_block = last
+            return len(items)
+
+        def delete(self):
+            """
+            Returns the current item, deletes it, moves to the next one.
+
+            @throws     StopIteration if there are no items left
+            @complexity O(B), where B is the block capacity
+            """
+            block = self.block
+            if block is None:
+                raise StopIteration("no more elements in list")
+            linked_list = self.linked_list
+            capacity = linked_list.block_capacity
+            item = block.items.pop(self.offset)
+
+            if not block.items:
+                if self.previous_block is None:
+                    linked_list.head = block.link
+                else:
+                    self.previous_block.link = block.link
+                self.block = block.link
+            else:
+                successor = block.link
+                if successor is not None and \
+                        len(block.items) < capacity // 2 and \
+                        len(block.items) + len(successor.items) <= capacity:
+                    block.items.extend(successor.items)
+                    block.link = successor.link
+                if self.offset == len(block.items):
+                    self.previous_block = block
+                    self.block = block.link
+                    self.offset = 0
+            linked_list.length -= 1
+            return item
+
+    def __iter__(self):
+        """Hook for "for x in my_list" and iter(my_list)"""
+        return self.ListIterator(self)
+
+    def __repr__(self):
+        """
+        @return     Unambiguous string representation of the list
+        @complexity Best and worst case: O(N)
+        """
+        return " ".join(repr(item) for item in self)
+
+    __str__ = __repr__
+
+
+## REGRESSION TESTING CODE
+
+def test_split_merge():
+    """Fills blocks past capacity to make them split, then empties them to
+    make them merge, checking the blocks sizes each time.
+    """
+    print("TESTING block split and merge")
+    my_list = UnrolledLinkedList(block_capacity=4)
+    it = iter(my_list)
+    for i in range(10):
+        it.add_here(i)
+    it.seek(2)
+    it.add_here('x')
+    print("Expected 0 1 'x' 2 3 4 5 6 7 8 9, got ", my_list)
+    print("Expected block sizes [2, 3, 4, 2], got ",
+          block_sizes(my_list))
+    it.seek(0)
+    for _ in range(4):
+        it.delete()
+    print("Expected 3 4 5 6 7 8 9, got ", my_list)
+    print("Expected block sizes [1, 4, 2], got ", block_sizes(my_list))
+    print("Expected length 7, got ", len(my_list))
+
+def test_iterator():
+    """Checks the iterator against a Python list after a long run of
+    random inserts, deletes and seeks.
+    """
+    import random
+    print("TESTING ListIterator")
+    my_list = UnrolledLinkedList(block_capacity=8)
+    reference = []
+    it = iter(my_list)
+    for step in range(2000):
+        index = random.randint(0, len(reference))
+        it.seek(index)
+        if reference and index < len(reference) and step % 3 == 0:
+            it.delete()
+            del reference[index]
+        else:
+            it.add_here(step)
+            reference.insert(index, step)
+    it.reset()
+    print("Expected True, got ", list(it) == reference)
+    print("Expected no empty or overfull blocks, got sizes from",
+          min(block_sizes(my_list)), "to", max(block_sizes(my_list)))
+
+def test_splice():
+    """Splices into the middle of a block, and into an empty list, and
+    short splices one after the other fill blocks up.
+    """
+    print("TESTING splice()")
+    my_list = UnrolledLinkedList(block_capacity=4)
+    it = iter(my_list)
+    print("Expected 3, got ", it.splice(range(3)))
+    it.seek(1)
+    it.splice("abcdef")
+    print("Expected 0 'a' 'b' 'c' 'd' 'e' 'f' 1 2, got ", my_list)
+    print("Expected block sizes [4, 3, 2], got ", block_sizes(my_list))
+    print("Expected 1 at position 7, got ", it.peek(), "at position",
+          it.position)
+    my_list = UnrolledLinkedList(block_capacity=4)
+    it = iter(my_list)
+    for i in range(10):
+        it.seek(len(my_list))
+        it.splice([i, -i])
+    print("Expected block sizes [4, 4, 4, 4, 4], got ", block_sizes(my_list))
+
+def block_sizes(my_list):
+    """Returns the number of items in each block of my_list."""
+    sizes = []
+    block = my_list.head
+    while block is not None:
+        sizes.append(len(block.items))
+        block = block.link
+    return sizes
+
+
+if __name__ == "__main__":
+    test_split_merge()
+    test_iterator()
+    test_splice()
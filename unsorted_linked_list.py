@@ -14,6 +14,14 @@ This file implements the list data type using linked nodes.
 """
 
 from node import Node
+from word_index import WordIndex
+from item_index import ItemIndex
+
+# How many positions a list remembers for seek() to start walking from
+FINGER_COUNT = 8
+
+# How many items write_to() and __repr__() convert and write at a time
+CHUNK_LINES = 4096
 
 class UnsortedLinkedList:
     """
@@ -22,6 +30,13 @@ class UnsortedLinkedList:
     Invariants for the class:
         (1) head points to the first node in the list, or null if empty
         (2) each node points to the next node in the position in the list
+        (3) length is the number of nodes reachable from head
+        (4) tail points to the last node in the list, or None if empty
+        (5) every index in indexes has been told about every node linked
+            into or out of the list since it was attached, and the node
+            before it
+        (6) each finger (position, previous, current) in fingers has current
+            as the node at position and previous as the one before it
     """
 
     def __init__(self, size=None):
@@ -37,6 +52,12 @@ class UnsortedLinkedList:
 
         """
         self.head = None
+        self.tail = None
+        self.length = 0
+        self.indexes = []
+        self.word_index = None
+        self.item_index = None
+        self.fingers = []
 
     def is_empty(self):
         """
@@ -47,6 +68,19 @@ class UnsortedLinkedList:
         """
         return self.head is None
 
+    def __len__(self):
+        """
+        Double-underscore methods plug into the syntax of Python.
+        my_list.__len__() will be called when a program uses len(my_list).
+
+        The length is kept up to date by every method that adds or removes
+        nodes, so we never need to walk the list to count them.
+
+        @return         the number of elements in the list
+        @complexity     best and worst case: O(1)
+        """
+        return self.length
+
     def __nonzero__(self):
         """
         For boolean context evaluation of unsorted linked lists under Python2.
@@ -102,6 +136,11 @@ class UnsortedLinkedList:
         @complexity     best and worst case: O(1)
         """
         self.head = None
+        self.tail = None
+        self.length = 0
+        self.fingers = []
+        for index in self.indexes:
+            index.cleared()
 
     def add_first(self, new_item):
         """
@@ -113,6 +152,34 @@ class UnsortedLinkedList:
         @complexity     best and worst case: O(1)
         """
         self.head = Node(new_item, self.head)
+        if self.tail is None:
+            self.tail = self.head
+        self.fingers_moved(0, 1)
+        self.length += 1
+        for index in self.indexes:
+            index.node_added(self.head, None)
+
+    def add_last(self, new_item):
+        """
+        Adds a new node (containing the input item) as the tail of the list.
+
+        @param          new_item to add to this linked list
+        @post           list has one more element after the method is called
+        @post           list[len(list) - 1] equals new_item after the method
+                        is called
+        @complexity     best and worst case: O(1)
+        """
+        new_node = Node(new_item, None)
+        previous = self.tail
+        if previous is None:
+            self.head = new_node
+        else:
+            previous.link = new_node
+        self.tail = new_node
+        self.fingers_moved(self.length, 1)
+        self.length += 1
+        for index in self.indexes:
+            index.node_added(new_node, previous)
 
     def add(self, new_item):
         """
@@ -120,6 +187,30 @@ class UnsortedLinkedList:
         """
         self.add_first(new_item)
 
+    def extend(self, items):
+        """
+        Adds every item of an iterable at the end of the list, in order.
+
+        @param      items: iterable of the items to add
+        @return     the number of items added
+        @complexity O(M), where M is the number of items added: we seek
+                    straight to the tail, then splice them in there
+        """
+        list_it = iter(self)
+        list_it.seek(self.length)
+        return list_it.splice(items)
+
+    @classmethod
+    def from_iterable(cls, items):
+        """
+        Creates a list holding the items of an iterable, in order.
+
+        @complexity O(M), where M is the number of items
+        """
+        new_list = cls()
+        iter(new_list).splice(items)
+        return new_list
+
     def find_linear(self, item):
         """
         Internal method for finding the first node containing the input item.
@@ -129,12 +220,29 @@ class UnsortedLinkedList:
                     otherwise, the address of the first node the item
                     appears in
         @complexity best case: O(1) (first item), worst case: O(N) (not there)
+                    Expected O(1) with an item index, see ItemIndex.first().
         """
+        if self.item_index is not None:
+            return self.item_index.first(item)
         current = self.head
         while current is not None and current.item != item:
             current = current.link;
         return current
 
+    def __contains__(self, item):
+        """
+        Double-underscore methods plug into the syntax of Python.
+        my_list.__contains__(item) will be called when a program uses the
+        syntax "item in my_list".
+
+        @return     true if item is in the list
+        @complexity expected O(1) with an item index, otherwise as for
+                    find_linear()
+        """
+        if self.item_index is not None:
+            return item in self.item_index
+        return self.find_linear(item) is not None
+
     def delete_item(self, delitem):
         """
         Deletes the first node (if any) containing the input item.
@@ -147,11 +255,28 @@ class UnsortedLinkedList:
         @post       if item wasn't in list, list is unchanged
         @throws     Exception thrown if item does not exist in the linked list
         @complexity best case: O(1) (first item), worst case: O(N) (not there)
+                    Expected O(1) with an item index, which knows the node
+                    holding the item and the node before it.
         """
         if self.head is None:           # list is empty
             raise LookupError("can't delete item from empty list")
+        elif self.item_index is not None:
+            current = self.item_index.first(delitem)
+            if current is None:
+                raise LookupError('item not found')
+            previous = self.item_index.predecessor(current)
+            if previous is None:
+                self.head = current.link
+            else:
+                previous.link = current.link
+            if current is self.tail:
+                self.tail = previous
         elif self.head.item == delitem:    # item is first element of list
+            current = self.head
+            previous = None
             self.head = self.head.link
+            if self.head is None:
+                self.tail = None
         else:
             current = self.head.link    # look for item in elements #2 to last
             previous = self.head
@@ -162,8 +287,183 @@ class UnsortedLinkedList:
                 raise LookupError('item not found')
             else:                       # item was found
                 previous.link = current.link
+                if current is self.tail:
+                    self.tail = previous
+        # We don't know the position of the node deleted
+        self.fingers = []
+        self.length -= 1
+        for index in self.indexes:
+            index.node_removed(current, previous)
         return True
 
+    def remember_finger(self, position, previous, current):
+        """
+        Remembers a position in the list, with its node and the one before
+        it, for seek() to start from later. The oldest finger is forgotten
+        once there are FINGER_COUNT of them.
+
+        @complexity O(F), where F is FINGER_COUNT
+        """
+        fingers = self.fingers
+        for i, finger in enumerate(fingers):
+            if finger[0] == position:
+                del fingers[i]
+                break
+        else:
+            if len(fingers) >= FINGER_COUNT:
+                del fingers[0]
+        fingers.append((position, previous, current))
+
+    def nearest_finger(self, index):
+        """
+        @return     the finger at the highest position not after index, or
+                    None if there is none
+        @complexity O(F), where F is FINGER_COUNT
+        """
+        nearest = None
+        for finger in self.fingers:
+            if finger[0] <= index and \
+                    (nearest is None or finger[0] > nearest[0]):
+                nearest = finger
+        return nearest
+
+    def fingers_moved(self, position, delta):
+        """
+        Keeps the fingers right after delta items were added at position
+        (delta > 0), or the item at position was deleted (delta == -1).
+
+        Fingers after the change move by delta. Those whose previous node
+        is no longer the one before their current node, or whose current
+        node was deleted, are forgotten.
+
+        @complexity O(F), where F is FINGER_COUNT
+        """
+        if not self.fingers:
+            return
+        if delta > 0:
+            first_moved = position + 1
+            broken = (position,)
+        else:
+            first_moved = position + 2
+            broken = (position, position + 1)
+        self.fingers = [(finger[0] + delta, finger[1], finger[2])
+                        if finger[0] >= first_moved else finger
+                        for finger in self.fingers
+                        if finger[0] not in broken]
+
+    def enable_word_index(self):
+        """
+        Attaches a WordIndex to the list, indexing the nodes already in it,
+        and keeps it up to date from then on. Does nothing if there is one.
+
+        @return     the list's word index
+        @post       word_index is the attached index
+        @complexity O(N*L), where L is the average length of an item
+        """
+        if self.word_index is None:
+            self.word_index = self.attach_index(WordIndex())
+        return self.word_index
+
+    def enable_item_index(self):
+        """
+        Attaches an ItemIndex to the list, indexing the nodes already in it,
+        and keeps it up to date from then on, making find_linear(),
+        delete_item() and "in" expected O(1). Does nothing if there is one.
+
+        @return     the list's item index
+        @post       item_index is the attached index
+        @complexity O(N)
+        """
+        if self.item_index is None:
+            self.item_index = self.attach_index(ItemIndex(self))
+        return self.item_index
+
+    def attach_index(self, index):
+        """
+        Tells index about every node already in the list, and adds it to
+        the indexes kept up to date from then on.
+
+        @return     index
+        @complexity O(N) times the cost of index.node_added()
+        """
+        previous = None
+        current = self.head
+        while current is not None:
+            index.node_added(current, previous)
+            previous = current
+            current = current.link
+        self.indexes.append(index)
+        return index
+
+    def positions_of(self, nodes):
+        """
+        Finds where in the list some of its nodes are, as an index does not
+        know their positions. Stops as soon as they have all been found.
+
+        @param      nodes: a set of nodes in the list
+        @return     generator of (position, item) for each of the nodes,
+                    in list order
+        @complexity O(P), where P is the position of the last of the nodes
+        """
+        remaining = len(nodes)
+        position = 0
+        current = self.head
+        while remaining > 0 and current is not None:
+            if current in nodes:
+                yield position, current.item
+                remaining -= 1
+            position += 1
+            current = current.link
+
+    def walked(self, steps):
+        """
+        Called by chunks() with the number of nodes it walked. Does nothing:
+        stats.enable_counters() replaces it to count them.
+        """
+
+    def chunks(self, chunk_lines=CHUNK_LINES, convert=str):
+        """
+        Walks the list from its head, converting its items a run at a time.
+
+        @param      chunk_lines: most items in a run
+        @param      convert: function from an item to a string
+        @return     generator of lists of at most chunk_lines converted
+                    items, in list order
+        @complexity O(N) times the cost of convert
+        """
+        chunk = []
+        current = self.head
+        while current is not None:
+            chunk.append(convert(current.item))
+            if len(chunk) == chunk_lines:
+                self.walked(len(chunk))
+                yield chunk
+                chunk = []
+            current = current.link
+        if chunk:
+            self.walked(len(chunk))
+            yield chunk
+
+    def write_to(self, stream, chunk_lines=CHUNK_LINES):
+        """
+        Writes every item of the list to stream as a line of its own.
+
+        Items are joined and written chunk_lines at a time, so a buffered
+        stream sees one write per chunk instead of one per item, and only
+        one chunk of text is held in memory at once.
+
+        @param      stream: a text stream to write to
+        @param      chunk_lines: how many items to write at a time
+        @return     the number of lines written
+        @post       the list is unchanged
+        @complexity O(N), for N items
+        """
+        count = 0
+        for chunk in self.chunks(chunk_lines):
+            stream.write("\n".join(chunk) + "\n")
+            count += len(chunk)
+        return count
+
 
     class ListIterator:
         """
@@ -182,12 +482,14 @@ class UnsortedLinkedList:
 
             @post       the created iterator object has the current property
                         pointing to the head of the list and previous to None.
+                        position, the index of the current node, is 0.
             @complexity best and worst case: O(1)
 
             """
             self.linked_list = linked_list
             self.current = linked_list.head
             self.previous = None
+            self.position = 0
 
         def __iter__(self):
             """required so Python recognises it as an iterator"""
@@ -215,6 +517,7 @@ class UnsortedLinkedList:
                 item = self.current.item
                 self.previous = self.current
                 self.current = self.current.link
+                self.position += 1
                 return item
 
         def next(self):
@@ -257,7 +560,14 @@ class UnsortedLinkedList:
                     self.linked_list.head = newcurrent
                 else:                               # elements #2 to last
                     self.previous.link = newcurrent
+                removed = self.current
                 self.current = newcurrent
+                if removed is self.linked_list.tail:
+                    self.linked_list.tail = self.previous
+                self.linked_list.fingers_moved(self.position, -1)
+                self.linked_list.length -= 1
+                for index in self.linked_list.indexes:
+                    index.node_removed(removed, self.previous)
 
                 return item
 
@@ -306,6 +616,60 @@ class UnsortedLinkedList:
             """
             self.current = self.linked_list.head
             self.previous = None
+            self.position = 0
+
+        def walked(self, steps):
+            """
+            Called by seek() with the number of nodes it stepped over.
+            Does nothing: stats.enable_counters() replaces it to count them.
+            """
+
+        def seek(self, index):
+            """
+            Moves the iterator so that the node at index is the current one,
+            i.e. the next call to next() returns the item at that index.
+            The first item is at index 0, and seeking to len(list) leaves
+            the iterator past the last item, ready to add_here() at the end.
+
+            The walk starts from the nearest position before index out of
+            the current node, the head and the fingers the list remembers
+            from earlier seeks, and the position reached is remembered in
+            turn, so going back to a line near one seen lately is cheap.
+            Seeking to the end jumps straight to the tail. Like the rest of
+            the iterator, this assumes the list has only been changed
+            through this iterator since it was last reset.
+
+            @param      index of the node to move to
+            @raises     IndexError if index is not in 0..len(list)
+            @post       position == index, previous points to the node
+                        before it (None if index is 0)
+            @complexity best case O(1) (already there, or the end, or next
+                        to a finger), worst case O(N)
+            """
+            if index < 0 or index > len(self.linked_list):
+                raise IndexError("list index out of range")
+            if index == len(self.linked_list):
+                self.previous = self.linked_list.tail
+                self.current = None
+                self.position = index
+                return
+            if index < self.position:
+                self.reset()
+            finger = self.linked_list.nearest_finger(index)
+            if finger is not None and finger[0] > self.position:
+                self.position, self.previous, self.current = finger
+
+            previous = self.previous
+            current = self.current
+            steps = index - self.position
+            for _ in range(steps):
+                previous = current
+                current = current.link
+            self.walked(steps)
+            self.previous = previous
+            self.current = current
+            self.position = index
+            self.linked_list.remember_finger(index, previous, current)
 
         def add_here(self, new_item):
             """Adds an item to the list, between previous and current.
@@ -314,10 +678,12 @@ class UnsortedLinkedList:
             @since      31 Aug 2013
             @param      new_item: item to be added
             @post       new_item will be added to the list, between previous
-                        and current. previous will point the newly added item.
+                        and current. previous will point the newly added item,
+                        and position moves on by one.
             @complexity Best/Worst: O(1)
             """
             new_node = Node(new_item, None)
+            previous = self.previous
 
             if self.linked_list.is_empty():
                 self.linked_list.head = new_node
@@ -335,11 +701,69 @@ class UnsortedLinkedList:
                     self.previous.link = new_node
                     new_node.link = self.current
                     self.previous = new_node
+            if self.current is None:
+                self.linked_list.tail = new_node
+            self.linked_list.fingers_moved(self.position, 1)
+            self.linked_list.length += 1
+            self.position += 1
+            for index in self.linked_list.indexes:
+                index.node_added(new_node, previous)
+
+        def splice(self, items):
+            """
+            Adds every item of an iterable between previous and current, in
+            order, as add_here() would one at a time.
+
+            The new nodes are chained together first, and the chain is then
+            linked into the list with two pointer updates, so each item
+            costs one node and one link instead of a call to add_here().
+
+            @param      items: iterable of the items to add
+            @return     the number of items added
+            @post       previous points to the last added node, and position
+                        moves on by the number of items
+            @complexity O(M), where M is the number of items
+            """
+            first = Node(None, None)
+            last = first
+            count = 0
+            for count, item in enumerate(items, 1):
+                last.link = last = Node(item, None)
+            if count == 0:
+                return 0
+            first = first.link
+            before = self.previous
+
+            last.link = self.current
+            if self.current is None:
+                self.linked_list.tail = last
+            if before is None:
+                self.linked_list.head = first
+            else:
+                before.link = first
+            self.previous = last
+            self.linked_list.fingers_moved(self.position, count)
+            self.linked_list.length += count
+            self.position += count
+            for index in self.linked_list.indexes:
+                previous = before
+                node = first
+                while node is not last.link:
+                    index.node_added(node, previous)
+                    previous = node
+                    node = node.link
+            return count
 
 
     def delete_item_via_iterator(self, delitem):
         """Same as delete_item() above, only this time using internal iterator
+
+        With an item index, it is the same as delete_item(), in expected O(1).
         """
+        if self.item_index is not None:
+            if delitem not in self.item_index:
+                raise LookupError("item not found")
+            return self.delete_item(delitem)
         it = iter(self)
         while it.has_next():
             if it.peek() != delitem:
@@ -364,13 +788,17 @@ class UnsortedLinkedList:
         Used to convert the elements of the queue into an unambiguous string,
         following the order front-to-back. Used by `repr(my_list)`.
 
+        The items' representations are joined a chunk at a time, so that
+        only one chunk of them is held apart from the result.
+
         @return     Unambiguous string representation of the list
         @post       List is unchanged
         @complexity Best and worst case: O(N)*O_(_repr_,join) (that is, O(N)
                     multiplied by whatever complexity __repr__ of the
                     underlying items and concatenation).
         """
-        return " ".join(repr(item) for item in self)
+        return " ".join(" ".join(chunk)
+                        for chunk in self.chunks(convert=repr))
 
     def __str__(self):
         """
@@ -442,18 +870,40 @@ def test_is_full():
 
 def test_add_first():
     """One test case: a list of any length.
-    We should also check for lenght increase by one, but implementing a len()
-    function has been left as an exercise to the students.
+    We also check for length increase by one.
     """
     my_list = UnsortedLinkedList(5)
     print("TESTING addFirst()")
     my_list.add_first(9)
     print("Expected 9, got ", my_list.head.item)
+    print("Expected length 1, got ", len(my_list))
     my_list.add_first(5)
     print("Expected 5, got ", my_list.head.item)
     my_list.add_first(1)
     my_list.add_first(14)
     print("Expected 14, got ", my_list.head.item)
+    print("Expected length 4, got ", len(my_list))
+
+def test_len():
+    """Boundary analysis gives three cases: empty list, list grown by
+    adding, and list shrunk by deleting (via the list and via an iterator).
+    """
+    my_list = UnsortedLinkedList()
+    print("TESTING __len__()")
+    print("Expected 0, got ", len(my_list))
+    it = iter(my_list)
+    for i in range(5):
+        it.add_here(i)
+    my_list.add_first('spam')
+    print("Expected 6, got ", len(my_list))
+    my_list.delete_item(3)
+    my_list.delete_item_via_iterator('spam')
+    print("Expected 4, got ", len(my_list))
+    it.reset()
+    it.delete()
+    print("Expected 3, got ", len(my_list))
+    my_list.reset()
+    print("Expected 0, got ", len(my_list))
 
 def test_delete_item():
     """For successful deletion, three boundary conditions: delete first
@@ -547,6 +997,117 @@ def test_find_linear():
     print("Expected 40, got ", my_list.find_linear(40).item)
     print("Expected 50, got ", my_list.find_linear(50).item)
 
+def test_seek():
+    """Boundary analysis gives five cases: seek to the first item, to the
+    last item, past the end, backwards, and out of range.
+    """
+    print("TESTING seek()")
+    my_list = UnsortedLinkedList()
+    it = iter(my_list)
+    for i in range(10):
+        it.add_here(i)
+    it.seek(0)
+    print("Expected 0, got ", it.next())
+    it.seek(9)
+    print("Expected 9, got ", it.next())
+    it.seek(10)
+    it.add_here(10)
+    print("Expected 0 1 2 3 4 5 6 7 8 9 10, got ", my_list)
+    it.seek(4)
+    print("Expected 4 at position 4, got ", it.peek(), "at position",
+          it.position)
+    try:
+        it.seek(12)
+        print("Expected an exception, but something went wrong")
+    except IndexError as error:
+        print("Expected: <class 'IndexError'> : list index out of range")
+        print("Got     : ", type(error), ": ", error)
+
+def test_fingers():
+    """Seeks back to a line near one seen before, and checks the fingers
+    move with an insert before them and are forgotten by deletes.
+    """
+    print("TESTING seek() with fingers")
+    my_list = UnsortedLinkedList.from_iterable(range(100))
+    it = iter(my_list)
+    it.seek(80)
+    it.seek(10)
+    it.seek(82)
+    print("Expected 82, got ", it.peek())
+    print("Expected fingers at [80, 10, 82], got ",
+          [finger[0] for finger in my_list.fingers])
+    it.seek(5)
+    it.splice(["a", "b"])
+    print("Expected fingers at [82, 12, 84], got ",
+          [finger[0] for finger in my_list.fingers])
+    it.seek(84)
+    print("Expected 82, got ", it.peek())
+    it.delete()
+    print("Expected fingers at [12, 82], got ",
+          sorted(finger[0] for finger in my_list.fingers))
+    my_list.delete_item("a")
+    print("Expected [], got ", my_list.fingers)
+
+def test_add_last():
+    """Boundary analysis gives three cases: adding to an empty list, and
+    keeping the tail right when the last node is deleted, by item and by
+    the iterator.
+    """
+    print("TESTING add_last() and tail")
+    my_list = UnsortedLinkedList()
+    my_list.add_last(1)
+    my_list.add_last(2)
+    my_list.add_first(0)
+    print("Expected 0 1 2 with tail 2, got ", my_list, "with tail",
+          my_list.tail.item)
+    my_list.delete_item(2)
+    print("Expected tail 1, got ", my_list.tail.item)
+    it = iter(my_list)
+    it.seek(1)
+    it.delete()
+    my_list.add_last(3)
+    print("Expected 0 3 with tail 3, got ", my_list, "with tail",
+          my_list.tail.item)
+    it.seek(len(my_list))
+    it.add_here(4)
+    print("Expected 0 3 4 with tail 4, got ", my_list, "with tail",
+          my_list.tail.item)
+
+def test_write_to():
+    """Boundary analysis gives three cases: an empty list, a list that
+    fills its chunks exactly, and one that leaves a partial chunk.
+    """
+    import io
+    print("TESTING write_to()")
+    for items in ([], [1, 2, 3, 4], [1, 2, 3, 4, 5]):
+        my_list = UnsortedLinkedList.from_iterable(items)
+        out = io.StringIO()
+        count = my_list.write_to(out, chunk_lines=2)
+        print("Expected", repr("".join("%d\n" % i for i in items)), "in",
+              len(items), "lines, got ", repr(out.getvalue()), "in", count,
+              "lines")
+    print("Expected 1 2 3 4 5, got ", my_list)
+
+def test_splice():
+    """Boundary analysis gives four cases: splicing into an empty list, at
+    the head, in the middle, and nothing at all; then extend() at the end.
+    """
+    print("TESTING splice() and extend()")
+    my_list = UnsortedLinkedList.from_iterable(range(3, 6))
+    print("Expected 3 4 5 and length 3, got ", my_list, "and length",
+          len(my_list))
+    it = iter(my_list)
+    print("Expected 3, got ", it.splice(range(3)))
+    it.seek(4)
+    it.splice(iter(["a", "b"]))
+    print("Expected 0 1 2 3 'a' 'b' 4 5 at position 6, got ", my_list,
+          "at position", it.position)
+    print("Expected 0, got ", it.splice([]))
+    index = my_list.enable_word_index()
+    print("Expected 2, got ", my_list.extend(["c", "a"]))
+    print("Expected 10 and 2 lines with 'a', got ", len(my_list),
+          "and", len(index.lookup("a")), "lines with 'a'")
+
 def test_add_here():
     """
     Tests the add here function. Checks all four cases outlined in the prac
@@ -614,10 +1175,16 @@ if __name__ == "__main__":
         test_is_empty()
         test_is_full()
         test_add_first()
+        test_len()
         test_delete_item()
         test_delete_item_via_iterator()
         test_find_linear()
         test_add_here()
+        test_seek()
+        test_splice()
+        test_add_last()
+        test_fingers()
+        test_write_to()
     except Exception as e:
         print("Error, unexpected exception: ", e)
         raise e
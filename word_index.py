@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+"""
+An inverted index from the words in a linked list's lines to the nodes
+holding those lines, kept up to date as the list changes.
+
+Attach one to an UnsortedLinkedList with enable_word_index(). The list
+then tells the index about every node it links in or out, so looking up
+which lines contain a word costs O(1) instead of a scan of the list.
+
+A word is a run of letters, digits and underscores, and words are matched
+exactly, case included.
+
+@since          18 October 2026
+@input          none
+@output         only for regression testing
+@errorHandling  none
+@knownBugs      none
+"""
+
+import re
+
+WORD = re.compile(r"\w+")
+
+
+def words_of(item):
+    """
+    @return     the set of distinct words in item
+    @complexity O(L), where L is the length of the item
+    """
+    return set(WORD.findall(str(item)))
+
+
+class WordIndex:
+    """
+    Maps every word to the set of nodes whose item contains it.
+    """
+
+    def __init__(self):
+        """
+        Creates an empty index.
+
+        @complexity best and worst case: O(1)
+        """
+        self.nodes = {}
+
+    def node_added(self, node, previous=None):
+        """
+        Indexes a node just linked into the list (after previous, which the
+        word index has no use for).
+
+        @complexity O(L), where L is the length of the node's item
+        """
+        for word in words_of(node.item):
+            nodes = self.nodes.get(word)
+            if nodes is None:
+                self.nodes[word] = {node}
+            else:
+                nodes.add(node)
+
+    def node_removed(self, node, previous=None):
+        """
+        Forgets a node just unlinked from the list.
+
+        @complexity O(L), where L is the length of the node's item
+        """
+        for word in words_of(node.item):
+            nodes = self.nodes[word]
+            nodes.discard(node)
+            if not nodes:
+                del self.nodes[word]
+
+    def cleared(self):
+        """
+        Forgets every node, when the list has been emptied.
+
+        @complexity best and worst case: O(1)
+        """
+        self.nodes = {}
+
+    def lookup(self, word):
+        """
+        @return     the set of nodes whose item contains word (do not
+                    modify it)
+        @complexity best and worst case: O(1)
+        """
+        return self.nodes.get(word, frozenset())
+
+    def containing(self, fragment):
+        """
+        Finds the nodes whose item contains fragment anywhere, not only as
+        a whole word. A fragment of word characters can only occur inside
+        a word, so those are the nodes of the words that contain it.
+
+        @pre        fragment is made of word characters only
+        @return     new set of those nodes
+        @complexity O(V*W), for V distinct words of length up to W in the
+                    index, plus the number of nodes found
+        """
+        found = set()
+        for word, nodes in self.nodes.items():
+            if fragment in word:
+                found |= nodes
+        return found
+
+
+## REGRESSION TESTING CODE
+
+def test_word_index():
+    """Checks the index follows adds and deletes through the list and its
+    iterator, and finds words at the start, middle and end of the list.
+    """
+    from unsorted_linked_list import UnsortedLinkedList
+    print("TESTING WordIndex")
+    my_list = UnsortedLinkedList()
+    it = iter(my_list)
+    for line in ["the lost world", "a world apart", "lost and found"]:
+        it.add_here(line)
+    index = my_list.enable_word_index()
+    my_list.add_first("world war")
+    print("Expected [0, 1, 2], got ",
+          [p for p, _ in my_list.positions_of(index.lookup("world"))])
+    it.seek(2)
+    it.delete()
+    my_list.delete_item("lost and found")
+    print("Expected [0, 1], got ",
+          [p for p, _ in my_list.positions_of(index.lookup("world"))])
+    print("Expected [1], got ",
+          [p for p, _ in my_list.positions_of(index.lookup("lost"))])
+    print("Expected [0, 1], got ",
+          [p for p, _ in my_list.positions_of(index.containing("orl"))])
+    my_list.reset()
+    print("Expected {}, got ", index.nodes)
+
+
+if __name__ == "__main__":
+    test_word_index()